@@ -0,0 +1,339 @@
+"""
+Lightweight HTTP JSON API for price history, indicators, CAPM metrics and forecasts.
+
+Run it next to (or instead of) the Streamlit app:
+
+    python api.py --port 8000
+
+Endpoints (all GET):
+    /health                 (includes cache hit/miss metrics)
+    /history/<ticker>?period=5y
+    /indicators/<ticker>?period=5y&include=sma20,rsi
+    /capm/<ticker>?benchmark=^GSPC&rf=0.02
+    /forecast/<ticker>?model=ARIMA&horizon=30&auto_order=1
+    /bulk/history?tickers=AAPL,MSFT&period=1y
+    /bulk/capm?tickers=AAPL,MSFT&benchmark=^GSPC
+    /bulk/forecast?tickers=AAPL,MSFT&model=Holt-Winters&horizon=30
+
+Frame endpoints accept format=json (default), parquet or arrow. Bulk failures are
+listed under "errors" in JSON, in the b"api" schema metadata for Parquet/Arrow,
+and in an X-Errors header. Every response carries an ETag (suffixed "-gzip" for
+compressed bodies); send it back in If-None-Match to get a 304. JSON bodies are
+gzip-compressed when the client accepts it.
+"""
+import argparse
+import gzip
+import hashlib
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+import pandas as pd
+
+from helper.cache import cache_stats
+from helper.capm import compute_capm
+from helper.data_fetch import get_history
+from helper.forecasting import run_forecast, FORECAST_MODELS
+from helper.indicators import add_indicators, INDICATOR_COLUMNS
+
+# Short query-string keys for the indicator labels used by the UI
+INDICATOR_KEYS = {
+    "sma20": "SMA (20)",
+    "sma50": "SMA (50)",
+    "ema20": "EMA (20)",
+    "bollinger": "Bollinger Bands",
+    "rsi": "RSI",
+}
+MAX_BULK_TICKERS = 50
+BULK_WORKERS = 8
+GZIP_MIN_BYTES = 1024
+
+CONTENT_TYPES = {
+    "json": "application/json",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+class ApiError(Exception):
+    """Error that maps directly onto an HTTP status code."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# -------------------------------
+# Query Helpers
+# -------------------------------
+def _param(query: dict, name: str, default=None):
+    values = query.get(name)
+    return values[0] if values else default
+
+
+def _tickers(query: dict) -> list[str]:
+    raw = _param(query, "tickers", "")
+    tickers = [t.strip().upper() for t in raw.split(",") if t.strip()]
+    if not tickers:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Query parameter 'tickers' is required.")
+    if len(tickers) > MAX_BULK_TICKERS:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"At most {MAX_BULK_TICKERS} tickers per request.")
+    return list(dict.fromkeys(tickers))
+
+
+def _history(ticker: str, period: str) -> pd.DataFrame:
+    try:
+        data = get_history(ticker, period=period)
+    except RuntimeError as e:
+        raise ApiError(HTTPStatus.BAD_GATEWAY, str(e))
+    if data.empty:
+        raise ApiError(HTTPStatus.NOT_FOUND, f"No data found for {ticker}.")
+    return data
+
+
+# -------------------------------
+# Resources
+# -------------------------------
+def history_frame(ticker: str, query: dict) -> pd.DataFrame:
+    return _history(ticker, _param(query, "period", "5y"))
+
+
+def indicators_frame(ticker: str, query: dict) -> pd.DataFrame:
+    include = _param(query, "include", ",".join(INDICATOR_KEYS))
+    labels = []
+    for key in include.split(","):
+        key = key.strip().lower()
+        if key not in INDICATOR_KEYS:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Unknown indicator '{key}'.")
+        labels.append(INDICATOR_KEYS[key])
+    data = add_indicators(history_frame(ticker, query), labels)
+    columns = ["Close"] + [c for label in labels for c in INDICATOR_COLUMNS[label]]
+    return data[columns]
+
+
+def capm_metrics(ticker: str, query: dict) -> dict:
+    benchmark = _param(query, "benchmark", "^GSPC")
+    period = _param(query, "period", "5y")
+    try:
+        rf_rate = float(_param(query, "rf", 0.02))
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Query parameter 'rf' must be a number.")
+    stock = _history(ticker, period)["Close"]
+    bench = _history(benchmark, period)["Close"]
+    _, model, metrics = compute_capm(stock, bench, rf_rate)
+    if model is None:
+        raise ApiError(HTTPStatus.UNPROCESSABLE_ENTITY, f"Not enough data to compute CAPM for {ticker}.")
+    return {"ticker": ticker, "benchmark": benchmark, **metrics}
+
+
+def forecast_frame(ticker: str, query: dict) -> pd.DataFrame:
+    model_choice = _param(query, "model", FORECAST_MODELS[0])
+    if model_choice not in FORECAST_MODELS:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Unknown model '{model_choice}'. Choose from {FORECAST_MODELS}.")
+    try:
+        horizon = int(_param(query, "horizon", 30))
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Query parameter 'horizon' must be an integer.")
+    if not 1 <= horizon <= 365:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Query parameter 'horizon' must be between 1 and 365.")
+    auto_order = _param(query, "auto_order", "1") not in ("0", "false", "no")
+
+    series = _history(ticker, _param(query, "period", "2y"))["Close"].dropna()
+    try:
+        # Request threads search ARIMA orders in-process rather than forking a pool each
+        fc_df, _ = run_forecast(series, model_choice, horizon, ticker=ticker,
+                                auto_order=auto_order, max_workers=1)
+    except Exception as e:
+        raise ApiError(HTTPStatus.UNPROCESSABLE_ENTITY, f"Forecast model failed: {e}")
+    return fc_df
+
+
+def _bulk(fetch, tickers: list[str], query: dict) -> dict:
+    """Run a per-ticker resource for many tickers concurrently; failures are reported per ticker."""
+    def one(ticker):
+        try:
+            return ticker, fetch(ticker, query), None
+        except ApiError as e:
+            return ticker, None, str(e)
+
+    with ThreadPoolExecutor(max_workers=min(BULK_WORKERS, len(tickers))) as pool:
+        results = list(pool.map(one, tickers))
+    return {t: (value, error) for t, value, error in results}
+
+
+def bulk_frame(fetch, query: dict):
+    """Stack per-ticker frames into one long frame with a Ticker column."""
+    results = _bulk(fetch, _tickers(query), query)
+    frames = [
+        value.rename_axis("Date").reset_index().assign(Ticker=t)
+        for t, (value, _) in results.items() if value is not None
+    ]
+    errors = {t: error for t, (_, error) in results.items() if error}
+    if not frames:
+        raise ApiError(HTTPStatus.NOT_FOUND, "; ".join(f"{t}: {e}" for t, e in errors.items()))
+    combined = pd.concat(frames, ignore_index=True)
+    return combined[["Ticker"] + [c for c in combined.columns if c != "Ticker"]], errors
+
+
+# -------------------------------
+# Encoding
+# -------------------------------
+def _arrow_table(df: pd.DataFrame, extra: dict | None):
+    """Arrow table with `extra` stored as JSON under the b"api" schema metadata key."""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df)
+    if extra:
+        metadata = dict(table.schema.metadata or {})
+        metadata[b"api"] = json.dumps(extra).encode("utf-8")
+        table = table.replace_schema_metadata(metadata)
+    return table
+
+
+def encode_frame(df: pd.DataFrame, fmt: str, extra: dict | None = None) -> bytes:
+    """
+    Serialise a frame as column-oriented JSON, Parquet or an Arrow IPC stream.
+    `extra` (ticker, per-ticker errors) goes into the JSON body or the Arrow/Parquet schema metadata.
+    """
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        buf = io.BytesIO()
+        pq.write_table(_arrow_table(df, extra), buf, compression="zstd")
+        return buf.getvalue()
+    if fmt == "arrow":
+        import pyarrow as pa
+        import pyarrow.ipc
+
+        table = _arrow_table(df, extra)
+        sink = pa.BufferOutputStream()
+        options = pa.ipc.IpcWriteOptions(compression="zstd")
+        with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    frame = df.rename_axis("Date").reset_index() if isinstance(df.index, pd.DatetimeIndex) else df
+    payload = json.loads(frame.to_json(orient="split", index=False, date_format="iso"))
+    return json.dumps({**(extra or {}), **payload}).encode("utf-8")
+
+
+# -------------------------------
+# HTTP Handler
+# -------------------------------
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "StockForecastAPI/1.0"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        parts = [unquote(p) for p in url.path.strip("/").split("/") if p]
+        fmt = _param(query, "format", "json").lower()
+
+        try:
+            if fmt not in CONTENT_TYPES:
+                raise ApiError(HTTPStatus.BAD_REQUEST, f"Unknown format '{fmt}'.")
+            body, content_type, headers = self._route(parts, query, fmt)
+        except ApiError as e:
+            self._send_json(e.status, {"error": str(e)})
+            return
+        except Exception as e:
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+            return
+
+        self._send(HTTPStatus.OK, body, content_type, headers)
+
+    def _route(self, parts: list[str], query: dict, fmt: str):
+        frame_resources = {
+            "history": history_frame,
+            "indicators": indicators_frame,
+            "forecast": forecast_frame,
+        }
+
+        if parts == ["health"]:
+            return json.dumps({"status": "ok", "cache": cache_stats()}).encode("utf-8"), CONTENT_TYPES["json"], {}
+
+        if len(parts) == 2 and parts[0] in frame_resources:
+            ticker = parts[1].upper()
+            df = frame_resources[parts[0]](ticker, query)
+            return encode_frame(df, fmt, {"ticker": ticker}), CONTENT_TYPES[fmt], {}
+
+        if len(parts) == 2 and parts[0] == "capm":
+            return json.dumps(capm_metrics(parts[1].upper(), query)).encode("utf-8"), CONTENT_TYPES["json"], {}
+
+        if len(parts) == 2 and parts[0] == "bulk":
+            if parts[1] in frame_resources:
+                df, errors = bulk_frame(frame_resources[parts[1]], query)
+                # Binary consumers may not read schema metadata, so failures also go in a header
+                headers = {"X-Errors": json.dumps(errors)} if errors else {}
+                return encode_frame(df, fmt, {"errors": errors}), CONTENT_TYPES[fmt], headers
+            if parts[1] == "capm":
+                results = _bulk(capm_metrics, _tickers(query), query)
+                payload = {
+                    "results": {t: v for t, (v, _) in results.items() if v is not None},
+                    "errors": {t: e for t, (_, e) in results.items() if e},
+                }
+                return json.dumps(payload).encode("utf-8"), CONTENT_TYPES["json"], {}
+
+        raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown endpoint '/{'/'.join(parts)}'.")
+
+    def _send_json(self, status: HTTPStatus, payload: dict):
+        self._send(status, json.dumps(payload).encode("utf-8"), CONTENT_TYPES["json"])
+
+    def _send(self, status: HTTPStatus, body: bytes, content_type: str, headers: dict | None = None):
+        # Parquet/Arrow payloads are already compressed internally
+        encoding = None
+        accepts_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+        if content_type == CONTENT_TYPES["json"] and accepts_gzip and len(body) >= GZIP_MIN_BYTES:
+            encoding = "gzip"
+
+        # Strong validators must differ per content coding
+        digest = hashlib.sha1(body).hexdigest()
+        etag = f'"{digest}-gzip"' if encoding else f'"{digest}"'
+        if status == HTTPStatus.OK:
+            client_tags = [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]
+            if etag in client_tags or "*" in client_tags:
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header("ETag", etag)
+                self.send_header("Vary", "Accept-Encoding")
+                self.end_headers()
+                return
+
+        if encoding:
+            body = gzip.compress(body)
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Vary", "Accept-Encoding")
+        if status == HTTPStatus.OK:
+            self.send_header("Cache-Control", "max-age=300")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stock forecasting HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), ApiHandler)
+    print(f"Serving API on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
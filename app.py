@@ -4,8 +4,10 @@ from helper.home import page_home
 from helper.page_analysis import page_analysis
 from helper.page_prediction import page_prediction
 from helper.cpam_dashboard import page_capm_dashboard
+from helper.page_backtest import page_backtest
 from helper.about import page_about
 from helper.style_utils import load_global_css
+from helper.prewarm import start_scheduler
 
 # -------------------------------
 # Page Config & Global Styling
@@ -13,6 +15,9 @@ from helper.style_utils import load_global_css
 st.set_page_config(page_title="Stock Forecasting & Analysis", page_icon="📊", layout="wide")
 load_global_css()
 
+# Background cache warming for STOCK_WATCHLIST (no-op when unset)
+start_scheduler()
+
 # -------------------------------
 # Sidebar - Navigation Only
 # -------------------------------
@@ -23,7 +28,7 @@ with st.sidebar:
     # Navigation
     page = st.radio(
         "Navigate",
-        ["🏠 Home", "🔍 Stock Analysis", "📉 Stock Prediction", "📊 CAPM Dashboard", "ℹ️ About"],
+        ["🏠 Home", "🔍 Stock Analysis", "📉 Stock Prediction", "📊 CAPM Dashboard", "🧪 Backtest", "ℹ️ About"],
         index=0
     )
 
@@ -38,5 +43,7 @@ elif page == "📉 Stock Prediction":
     page_prediction()
 elif page == "📊 CAPM Dashboard":
     page_capm_dashboard()
+elif page == "🧪 Backtest":
+    page_backtest()
 else:
     page_about()
@@ -0,0 +1,208 @@
+import multiprocessing
+import os
+import threading
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.arima.model import ARIMA
+from statsmodels.tsa.stattools import kpss
+from helper.cache import cache_get, cache_set
+
+# -------------------------------
+# Settings
+# -------------------------------
+DEFAULT_ORDER = (5, 1, 0)
+
+# A stored order is re-used until this many new bars arrive or the last
+# close drifts by more than this fraction from the one it was fitted on.
+REFIT_AFTER_BARS = 20
+REFIT_AFTER_DRIFT = 0.10
+
+# Worker processes are started from a clean server process: the app and API are
+# multi-threaded, and forking them directly can deadlock the child.
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+
+# -------------------------------
+# Candidate Evaluation
+# -------------------------------
+def _fit_ic(values: np.ndarray, order: tuple, criterion: str):
+    """
+    Fit one ARIMA candidate and return (order, information criterion).
+    Runs inside worker processes, so it only takes plain arrays.
+    """
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            fit = ARIMA(values, order=order).fit()
+        ic = getattr(fit, criterion)
+        return order, float(ic) if np.isfinite(ic) else float("inf")
+    except Exception:
+        return order, float("inf")
+
+
+def _evaluate(values: np.ndarray, orders: list, criterion: str, pool) -> dict:
+    """Score a batch of orders, in the process pool when one is available."""
+    if not orders:
+        return {}
+    if pool is not None:
+        futures = [pool.submit(_fit_ic, values, o, criterion) for o in orders]
+        return dict(f.result() for f in futures)
+    return dict(_fit_ic(values, o, criterion) for o in orders)
+
+
+# -------------------------------
+# Shared Process Pool
+# -------------------------------
+_pools: dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(max_workers: int) -> ProcessPoolExecutor | None:
+    """Process pool of the given size, created once and re-used by every search."""
+    with _pools_lock:
+        pool = _pools.get(max_workers)
+        if pool is None:
+            try:
+                context = multiprocessing.get_context(POOL_START_METHOD)
+                pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+            except (OSError, NotImplementedError, ValueError):
+                return None
+            _pools[max_workers] = pool
+        return pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next search starts a fresh one."""
+    with _pools_lock:
+        for size, known in list(_pools.items()):
+            if known is pool:
+                del _pools[size]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def choose_d(values: np.ndarray, max_d: int = 2, alpha: float = 0.05) -> int:
+    """
+    Number of differences needed for stationarity, using repeated KPSS tests.
+    """
+    x = np.asarray(values, dtype="float64")
+    for d in range(max_d + 1):
+        if len(x) < 10:
+            return d
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            _, p_value, _, _ = kpss(x, regression="c", nlags="auto")
+        if p_value >= alpha:
+            return d
+        x = np.diff(x)
+    return max_d
+
+
+# -------------------------------
+# Stepwise Search
+# -------------------------------
+def select_arima_order(series: pd.Series, max_p: int = 5, max_q: int = 5, max_d: int = 2,
+                       criterion: str = "aic", max_workers: int | None = None) -> tuple:
+    """
+    Stepwise (p, d, q) search in the style of Hyndman-Khandakar.
+    d is fixed by KPSS; starting candidates and each neighbourhood of the
+    current best are fitted in parallel, and the search stops as soon as
+    no neighbour improves the information criterion (aic / bic / hqic).
+    Candidates run on a shared process pool kept for the life of the process;
+    max_workers=1 fits in-process, which callers already running on worker
+    threads should use instead of queueing behind one another on the pool.
+    """
+    values = pd.Series(series).dropna().to_numpy(dtype="float64")
+    if len(values) < 30:
+        return DEFAULT_ORDER
+
+    d = choose_d(values, max_d=max_d)
+    start = [(2, d, 2), (0, d, 0), (1, d, 0), (0, d, 1)]
+    start = [o for o in start if o[0] <= max_p and o[2] <= max_q]
+
+    pool = _get_pool(max_workers or DEFAULT_WORKERS) if max_workers != 1 else None
+
+    def score(orders: list) -> dict:
+        nonlocal pool
+        if pool is not None:
+            try:
+                return _evaluate(values, orders, criterion, pool)
+            except Exception:
+                # Broken pool (e.g. restricted sandbox, killed worker): finish in-process
+                _discard_pool(pool)
+                pool = None
+        return _evaluate(values, orders, criterion, None)
+
+    scores = score(start)
+    best = min(scores, key=scores.get)
+    while True:
+        p, _, q = best
+        neighbours = {
+            (p + dp, d, q + dq)
+            for dp in (-1, 0, 1)
+            for dq in (-1, 0, 1)
+            if (dp, dq) != (0, 0)
+        }
+        neighbours = [
+            o for o in neighbours
+            if 0 <= o[0] <= max_p and 0 <= o[2] <= max_q and o not in scores
+        ]
+        if not neighbours:
+            break
+        scores.update(score(neighbours))
+        candidate = min(scores, key=scores.get)
+        if scores[candidate] >= scores[best]:
+            break
+        best = candidate
+
+    if not np.isfinite(scores[best]):
+        return DEFAULT_ORDER
+    return best
+
+
+# -------------------------------
+# Per-Ticker Persistence
+# -------------------------------
+def _is_stale(entry: dict, series: pd.Series, criterion: str) -> bool:
+    """True when the data moved far enough from the fit that the order should be re-searched."""
+    if entry.get("criterion") != criterion:
+        return True
+    last_date = pd.Timestamp(entry.get("last_date"))
+    new_bars = int((series.index > last_date).sum())
+    if new_bars >= REFIT_AFTER_BARS or len(series) < entry.get("n_obs", 0) - REFIT_AFTER_BARS:
+        return True
+    last_close = entry.get("last_close") or 0.0
+    if last_close <= 0:
+        return True
+    drift = abs(float(series.iloc[-1]) - last_close) / last_close
+    return drift > REFIT_AFTER_DRIFT
+
+
+def auto_arima_order(ticker: str, series: pd.Series, criterion: str = "aic",
+                     force: bool = False, **search_kwargs) -> tuple[tuple, bool]:
+    """
+    ARIMA order for a ticker, re-using the stored order unless the data changed materially.
+    Returns (order, from_cache).
+    """
+    series = pd.Series(series).dropna()
+    key = ticker.upper()
+
+    entry = cache_get(f"arima_order:{key}")
+    if entry and not force and not _is_stale(entry, series, criterion):
+        return tuple(entry["order"]), True
+
+    order = select_arima_order(series, criterion=criterion, **search_kwargs)
+
+    cache_set(f"arima_order:{key}", {
+        "order": list(order),
+        "criterion": criterion,
+        "n_obs": int(len(series)),
+        "last_date": pd.Timestamp(series.index[-1]).isoformat(),
+        "last_close": float(series.iloc[-1]),
+        "fitted_at": datetime.now().isoformat(timespec="seconds"),
+    })
+    return order, False
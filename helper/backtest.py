@@ -0,0 +1,244 @@
+import numpy as np
+import pandas as pd
+import ta
+
+TRADING_DAYS = 252
+STRATEGIES = ["SMA Crossover", "EMA Crossover", "RSI Mean Reversion", "Bollinger Mean Reversion"]
+SIZING_METHODS = ["Fixed Fraction", "Volatility Target"]
+PERFORMANCE_COLUMNS = ["Total Return", "CAGR", "Volatility", "Sharpe", "Max Drawdown", "Trades", "Exposure"]
+
+
+# -------------------------------
+# Signals (target position per bar)
+# -------------------------------
+def _hold_between(entries: pd.Series, exits: pd.Series) -> pd.Series:
+    """Long from an entry bar until the next exit bar, without a per-bar loop."""
+    state = pd.Series(np.nan, index=entries.index)
+    state[exits.fillna(False).astype(bool)] = 0.0
+    state[entries.fillna(False).astype(bool)] = 1.0
+    return state.ffill().fillna(0.0)
+
+
+def crossover_signal(close: pd.Series, fast: int, slow: int, kind: str = "sma",
+                     allow_short: bool = False) -> pd.Series:
+    """+1 while the fast average is above the slow one, else 0 (or -1 when shorting)."""
+    if kind == "ema":
+        fast_ma = close.ewm(span=fast, adjust=False).mean()
+        slow_ma = close.ewm(span=slow, adjust=False).mean()
+    else:
+        fast_ma = close.rolling(fast).mean()
+        slow_ma = close.rolling(slow).mean()
+    signal = np.where(fast_ma > slow_ma, 1.0, -1.0 if allow_short else 0.0)
+    signal[slow_ma.isna().to_numpy()] = 0.0
+    return pd.Series(signal, index=close.index)
+
+
+def rsi_signal(close: pd.Series, window: int = 14, lower: float = 30, upper: float = 70) -> pd.Series:
+    """Buy when RSI drops below `lower`, exit when it rises above `upper`."""
+    rsi = ta.momentum.RSIIndicator(close, window=window).rsi()
+    return _hold_between(rsi < lower, rsi > upper)
+
+
+def bollinger_signal(close: pd.Series, window: int = 20, n_std: float = 2.0) -> pd.Series:
+    """Buy a close below the lower band, exit once price reverts to the middle band."""
+    mid = close.rolling(window).mean()
+    std = close.rolling(window).std()
+    return _hold_between(close < mid - n_std * std, close >= mid)
+
+
+def build_signal(close: pd.Series, strategy: str, params: dict, allow_short: bool = False) -> pd.Series:
+    if strategy == "SMA Crossover":
+        return crossover_signal(close, params["fast"], params["slow"], "sma", allow_short)
+    if strategy == "EMA Crossover":
+        return crossover_signal(close, params["fast"], params["slow"], "ema", allow_short)
+    if strategy == "RSI Mean Reversion":
+        return rsi_signal(close, params["window"], params["lower"], params["upper"])
+    if strategy == "Bollinger Mean Reversion":
+        return bollinger_signal(close, params["window"], params["n_std"])
+    raise ValueError(f"Unknown strategy: {strategy}")
+
+
+# -------------------------------
+# Position Sizing
+# -------------------------------
+def size_positions(signal: pd.Series, close: pd.Series, method: str = "Fixed Fraction",
+                   fraction: float = 1.0, target_vol: float = 0.15, max_leverage: float = 1.0,
+                   vol_window: int = 20) -> pd.Series:
+    """Scale a -1/0/+1 signal into an equity fraction."""
+    if method == "Volatility Target":
+        realised = close.pct_change().rolling(vol_window).std() * np.sqrt(TRADING_DAYS)
+        scale = (target_vol / realised).clip(upper=max_leverage).fillna(0.0)
+        return signal * scale
+    return signal * fraction
+
+
+# -------------------------------
+# Performance Statistics
+# -------------------------------
+def performance_stats(returns: np.ndarray, positions: np.ndarray, axis: int = 0) -> dict:
+    """
+    Total return, CAGR, volatility, Sharpe, max drawdown, trades and exposure,
+    reduced along the time `axis` (works for a single run or a parameter grid).
+    Every bar passed in counts, so callers trim to the instrument's traded range.
+    """
+    returns = np.asarray(returns, dtype="float64")
+    positions = np.asarray(positions)
+    n = returns.shape[axis]
+
+    mean = returns.mean(axis=axis)
+    std = returns.std(axis=axis, ddof=1)
+
+    # Drawdown in place: equity -> equity / running peak, one temporary at a time
+    equity = np.add(returns, 1.0)
+    np.cumprod(equity, axis=axis, out=equity)
+    final = np.take(equity, -1, axis=axis)
+    peak = np.maximum.accumulate(equity, axis=axis)
+    np.divide(equity, peak, out=equity)
+    del peak
+    max_drawdown = equity.min(axis=axis) - 1.0
+    del equity
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, mean / std * np.sqrt(TRADING_DAYS), 0.0)
+        cagr = np.where(final > 0, final ** (TRADING_DAYS / max(n, 1)) - 1.0, -1.0)
+    # Entries, exits and reversals; volatility-target rebalances are not trades
+    trades = (np.diff(np.sign(positions), axis=axis) != 0).sum(axis=axis)
+
+    return {
+        "Total Return": final - 1.0,
+        "CAGR": cagr,
+        "Volatility": std * np.sqrt(TRADING_DAYS),
+        "Sharpe": sharpe,
+        "Max Drawdown": max_drawdown,
+        "Trades": trades,
+        "Exposure": (np.abs(positions) > 1e-12).mean(axis=axis),
+    }
+
+
+# -------------------------------
+# Single Backtest
+# -------------------------------
+def run_backtest(close: pd.Series, positions: pd.Series, cost_bps: float = 10.0,
+                 initial_capital: float = 10_000.0):
+    """
+    Vectorised backtest: the position decided on bar t is held over bar t+1,
+    and every change in position pays `cost_bps` of the traded notional.
+    Returns (frame with Position / Strategy Return / Equity / Buy & Hold / Drawdown, stats dict).
+    """
+    close = close.astype("float64")
+    asset_ret = close.pct_change().fillna(0.0)
+    held = positions.shift(1).fillna(0.0)
+    costs = held.diff().abs().fillna(held.abs()) * cost_bps / 10_000
+    strat_ret = held * asset_ret - costs
+
+    equity = initial_capital * (1.0 + strat_ret).cumprod()
+    result = pd.DataFrame({
+        "Close": close,
+        "Position": held,
+        "Strategy Return": strat_ret,
+        "Equity": equity,
+        "Buy & Hold": initial_capital * (1.0 + asset_ret).cumprod(),
+        "Drawdown": equity / equity.cummax() - 1.0,
+    })
+    stats = {k: float(v) for k, v in performance_stats(strat_ret.to_numpy(), held.to_numpy()).items()}
+    return result, stats
+
+
+# -------------------------------
+# Parameter Sweep
+# -------------------------------
+SWEEP_CHUNK_ELEMENTS = 1 << 22  # ~32 MB per float64 temporary
+
+
+def sma_stack(prices: np.ndarray, windows) -> np.ndarray:
+    """
+    Rolling means for every window at once: (T,) or (T, N) prices -> (W, T[, N]).
+    Entries whose window is not yet full or contains a missing price are NaN.
+    """
+    prices = np.asarray(prices, dtype="float64")
+    missing = np.isnan(prices)
+    zeros = np.zeros((1,) + prices.shape[1:])
+    csum = np.concatenate([zeros, np.cumsum(np.where(missing, 0.0, prices), axis=0)])
+    cmiss = np.concatenate([zeros, np.cumsum(missing, axis=0)])
+
+    out = np.full((len(windows),) + prices.shape, np.nan)
+    for i, w in enumerate(windows):
+        if w > prices.shape[0]:
+            continue
+        window_sum = csum[w:] - csum[:-w]
+        window_gaps = cmiss[w:] - cmiss[:-w]
+        out[i, w - 1:] = np.where(window_gaps > 0, np.nan, window_sum / w)
+    return out
+
+
+def _sweep_one(close: np.ndarray, fast_windows: np.ndarray, slow_windows: np.ndarray,
+               cost: float, short_value: int) -> dict:
+    """
+    All valid (fast < slow) crossover pairs on one ticker's own bars. Each fast
+    window only sees the slow windows above it, in chunks of SWEEP_CHUNK_ELEMENTS.
+    """
+    T = len(close)
+    asset_ret = np.zeros(T)
+    asset_ret[1:] = close[1:] / close[:-1] - 1.0
+    fast_ma = sma_stack(close[:-1], fast_windows)
+    slow_ma = sma_stack(close[:-1], slow_windows)
+    chunk = max(1, SWEEP_CHUNK_ELEMENTS // T)
+
+    parts = []
+    for i, fast in enumerate(fast_windows):
+        first_slow = np.searchsorted(slow_windows, fast, side="right")
+        for lo in range(first_slow, len(slow_windows), chunk):
+            hi = min(lo + chunk, len(slow_windows))
+            slow = slow_ma[lo:hi]
+
+            # Signal decided on bar t is held over bar t+1 (MAs are built on close[:-1])
+            held = np.zeros((hi - lo, T), dtype=np.int8)
+            held[:, 1:] = fast_ma[i] > slow
+            if short_value:
+                held[:, 1:] *= 2
+                held[:, 1:] -= 1
+                held[:, 1:][np.isnan(slow)] = 0
+
+            # held[:, 0] is always flat, so turnover starts at the second bar
+            strat_ret = held * asset_ret
+            strat_ret[:, 1:] -= np.abs(held[:, 1:] - held[:, :-1]) * cost
+
+            stats = performance_stats(strat_ret, held, axis=1)
+            stats["Fast"] = np.full(hi - lo, fast)
+            stats["Slow"] = slow_windows[lo:hi]
+            parts.append(stats)
+
+    if not parts:
+        return {}
+    return {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+
+
+def sweep_sma_crossover(prices: pd.DataFrame, fast_windows, slow_windows,
+                        cost_bps: float = 10.0, allow_short: bool = False) -> pd.DataFrame:
+    """
+    Backtest every (fast, slow) SMA pair on every ticker column of `prices`.
+    Each ticker runs on its own non-missing bars, so outer-joined histories of
+    different lengths or exchange calendars give the same stats as run_backtest.
+    Returns one row per ticker and valid pair (fast < slow) with the performance stats.
+    """
+    fast_windows = np.asarray(sorted(set(fast_windows)), dtype=int)
+    slow_windows = np.asarray(sorted(set(slow_windows)), dtype=int)
+    cost = cost_bps / 10_000
+    short_value = -1 if allow_short else 0
+
+    frames = []
+    for ticker in prices.columns:
+        close = prices[ticker].astype("float64").dropna().to_numpy()
+        if len(close) < 2:
+            continue
+        stats = _sweep_one(close, fast_windows, slow_windows, cost, short_value)
+        if not stats:
+            continue
+        frame = pd.DataFrame({"Ticker": ticker, "Fast": stats.pop("Fast"), "Slow": stats.pop("Slow")})
+        for name in PERFORMANCE_COLUMNS:
+            frame[name] = stats[name]
+        frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame(columns=["Ticker", "Fast", "Slow"] + PERFORMANCE_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
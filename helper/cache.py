@@ -0,0 +1,462 @@
+"""
+Shared cache used by data fetches, fundamentals, indicators and forecasts.
+
+The backend is chosen by the STOCK_CACHE_URL environment variable:
+
+    sqlite:///.cache/stock_cache.sqlite   (default) local file, shared by processes on one host
+    redis://localhost:6379/0              Redis-protocol server, shared by all replicas
+    memory://                             per-process only
+
+DataFrames and Series are stored as Parquet, tuples element-wise, and anything
+else as JSON. Values are never pickled, so a writable shared backend cannot be
+used to run code in the app or API processes; values that cannot be encoded
+this way are simply not cached.
+"""
+import base64
+import contextlib
+import contextvars
+import functools
+import hashlib
+import inspect
+import io
+import json
+import os
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+import pandas as pd
+
+DEFAULT_CACHE_URL = "sqlite:///" + os.path.join(".cache", "stock_cache.sqlite")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+ACCESS_RESOLUTION = 60  # seconds between LRU timestamp updates for a hot key
+_MISSING = object()
+_ttl_floor: contextvars.ContextVar[float | None] = contextvars.ContextVar("cache_ttl_floor", default=None)
+
+
+# -------------------------------
+# Serialisation
+# -------------------------------
+def _frame_to_parquet(df: pd.DataFrame) -> bytes:
+    buf = io.BytesIO()
+    df.to_parquet(buf)
+    return buf.getvalue()
+
+
+def serialize(value) -> bytes:
+    """
+    Encode a value as tagged bytes: Parquet for frames/series, JSON for everything else.
+    Raises TypeError for values that are neither frames nor JSON-serialisable.
+    """
+    if isinstance(value, pd.DataFrame):
+        return b"F" + _frame_to_parquet(value)
+    if isinstance(value, pd.Series):
+        header = json.dumps({"name": value.name}).encode("utf-8")
+        frame = value.to_frame(name="__value__")
+        return b"S" + struct.pack(">I", len(header)) + header + _frame_to_parquet(frame)
+    if isinstance(value, tuple):
+        parts = [base64.b64encode(serialize(v)).decode("ascii") for v in value]
+        return b"T" + json.dumps(parts).encode("utf-8")
+    return b"J" + json.dumps(value).encode("utf-8")
+
+
+def deserialize(data: bytes):
+    tag, body = data[:1], data[1:]
+    if tag == b"F":
+        return pd.read_parquet(io.BytesIO(body))
+    if tag == b"S":
+        (size,) = struct.unpack(">I", body[:4])
+        header = json.loads(body[4:4 + size])
+        return pd.read_parquet(io.BytesIO(body[4 + size:]))["__value__"].rename(header["name"])
+    if tag == b"T":
+        return tuple(deserialize(base64.b64decode(v)) for v in json.loads(body))
+    if tag == b"J":
+        return json.loads(body)
+    raise ValueError(f"Unknown cache payload tag: {tag!r}")
+
+
+# -------------------------------
+# Backends
+# -------------------------------
+class CacheBackend:
+    """
+    Byte-oriented key/value store with TTLs and hit/miss counters.
+    Subclasses implement _get/_set/_delete/_clear; get/set/delete add the metrics.
+    """
+
+    def __init__(self):
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "sets": 0, "evictions": 0, "errors": 0}
+
+    def _count(self, name: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[name] += n
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def get(self, key: str) -> bytes | None:
+        value = self._get(key)
+        self._count("hits" if value is not None else "misses")
+        return value
+
+    def set(self, key: str, value: bytes, ttl: float | None = None):
+        self._set(key, value, ttl)
+        self._count("sets")
+
+    def add(self, key: str, value: bytes, ttl: float | None = None) -> bool:
+        """Store only if the key is absent (or expired); True when this call stored it."""
+        return self._add(key, value, ttl)
+
+    def delete(self, key: str):
+        self._delete(key)
+
+    def clear(self):
+        self._clear()
+
+    def _get(self, key):
+        raise NotImplementedError
+
+    def _set(self, key, value, ttl):
+        raise NotImplementedError
+
+    def _add(self, key, value, ttl):
+        raise NotImplementedError
+
+    def _delete(self, key):
+        raise NotImplementedError
+
+    def _clear(self):
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """In-process LRU, bounded by total value size."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        super().__init__()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._items: OrderedDict = OrderedDict()
+        self._size = 0
+
+    def _get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires is not None and expires < time.time():
+                self._remove(key)
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def _set(self, key, value, ttl):
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def _add(self, key, value, ttl):
+        # Check and insert under one lock hold, otherwise two threads can both claim a lock
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and (item[1] is None or item[1] >= time.time()):
+                return False
+            self._store(key, value, ttl)
+            return True
+
+    def _store(self, key, value, ttl):
+        """Insert and evict down to max_bytes; callers hold self._lock."""
+        expires = time.time() + ttl if ttl else None
+        self._remove(key)
+        self._items[key] = (value, expires)
+        self._size += len(value)
+        while self._size > self.max_bytes and len(self._items) > 1:
+            self._remove(next(iter(self._items)))
+            self._count("evictions")
+
+    def _remove(self, key):
+        item = self._items.pop(key, None)
+        if item is not None:
+            self._size -= len(item[0])
+
+    def _delete(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def _clear(self):
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Single-file cache shared by every process on the host (WAL mode).
+    Least-recently-used entries are evicted once the stored values exceed max_bytes.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        super().__init__()
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+                " expires REAL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            self._local.conn = conn
+        return conn
+
+    def _get(self, key):
+        now = time.time()
+        with self._conn() as conn:
+            row = conn.execute("SELECT value, expires, accessed FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] < now:
+                conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+            # Hits are reads; only take the write lock when the LRU stamp is stale
+            if now - row[2] > ACCESS_RESOLUTION:
+                conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+            return bytes(row[0])
+
+    def _set(self, key, value, ttl):
+        now = time.time()
+        expires = now + ttl if ttl else None
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), expires, now),
+            )
+            self._evict(conn, now)
+
+    def _add(self, key, value, ttl):
+        now = time.time()
+        expires = now + ttl if ttl else None
+        with self._conn() as conn:
+            conn.execute("DELETE FROM cache WHERE key = ? AND expires IS NOT NULL AND expires < ?", (key, now))
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO cache (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), expires, now),
+            )
+            return cur.rowcount == 1
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        conn.execute("DELETE FROM cache WHERE expires IS NOT NULL AND expires < ?", (now,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM cache ORDER BY accessed").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        self._count("evictions", evicted)
+
+    def _delete(self, key):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def _clear(self):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM cache")
+
+
+class RedisBackend(CacheBackend):
+    """
+    Cache on any Redis-protocol server (Redis, Valkey, KeyDB, or a stand-in such
+    as fakeredis passed in as `client`). Size bounds are enforced by the server:
+    run it with `maxmemory` and `maxmemory-policy allkeys-lru`.
+    """
+
+    def __init__(self, url: str | None = None, client=None, prefix: str = "stockcache:"):
+        super().__init__()
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def _get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def _set(self, key, value, ttl):
+        self.client.set(self.prefix + key, value, ex=int(ttl) if ttl else None)
+
+    def _add(self, key, value, ttl):
+        return bool(self.client.set(self.prefix + key, value, ex=int(ttl) if ttl else None, nx=True))
+
+    def _delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def _clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+def backend_from_url(url: str, max_bytes: int = DEFAULT_MAX_BYTES) -> CacheBackend:
+    parsed = urlparse(url)
+    if parsed.scheme == "sqlite":
+        return SQLiteBackend(url[len("sqlite:///"):], max_bytes=max_bytes)
+    if parsed.scheme in ("redis", "rediss", "unix"):
+        return RedisBackend(url)
+    if parsed.scheme == "memory":
+        return MemoryBackend(max_bytes=max_bytes)
+    raise ValueError(f"Unsupported cache URL: {url}")
+
+
+_backend: CacheBackend | None = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> CacheBackend:
+    """Process-wide backend, created from STOCK_CACHE_URL / STOCK_CACHE_MAX_MB on first use."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            url = os.environ.get("STOCK_CACHE_URL", DEFAULT_CACHE_URL)
+            max_bytes = int(float(os.environ.get("STOCK_CACHE_MAX_MB", DEFAULT_MAX_BYTES / 2**20)) * 2**20)
+            _backend = backend_from_url(url, max_bytes=max_bytes)
+        return _backend
+
+
+def set_backend(backend: CacheBackend):
+    """Swap the process-wide backend (e.g. for a Redis stand-in)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+def cache_stats() -> dict:
+    return get_backend().stats()
+
+
+# -------------------------------
+# Value Helpers
+# -------------------------------
+def cache_get(key: str, default=None):
+    backend = get_backend()
+    try:
+        data = backend.get(key)
+        return default if data is None else deserialize(data)
+    except Exception:
+        backend._count("errors")
+        return default
+
+
+def cache_set(key: str, value, ttl: float | None = None):
+    backend = get_backend()
+    floor = _ttl_floor.get()
+    if ttl is not None and floor is not None:
+        ttl = max(ttl, floor)
+    try:
+        backend.set(key, serialize(value), ttl)
+    except Exception:
+        backend._count("errors")
+
+
+@contextlib.contextmanager
+def min_ttl(seconds: float):
+    """
+    Within the block, entries written on this thread live at least `seconds`
+    (entries without a ttl still never expire), and cached() hits are re-stamped.
+    Used by the pre-warmer so warmed entries outlast their usual ttl until the next run.
+    """
+    token = _ttl_floor.set(seconds)
+    try:
+        yield
+    finally:
+        _ttl_floor.reset(token)
+
+
+def try_lock(name: str, ttl: float) -> bool:
+    """
+    Claim a named lock shared by every process on the backend (SET NX EX on Redis,
+    INSERT OR IGNORE on SQLite). It is not released early; it simply expires after ttl.
+    """
+    backend = get_backend()
+    try:
+        return backend.add(f"lock:{name}", b"J" + json.dumps(time.time()).encode("utf-8"), ttl)
+    except Exception:
+        backend._count("errors")
+        return False
+
+
+# -------------------------------
+# Decorator
+# -------------------------------
+def _fingerprint(value) -> str:
+    """Stable representation of an argument; frames and series are hashed by content."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        content = pd.util.hash_pandas_object(value, index=True).values.tobytes()
+        columns = repr(list(value.columns)) if isinstance(value, pd.DataFrame) else repr(value.name)
+        return "pd:" + hashlib.sha1(content + columns.encode()).hexdigest()
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_fingerprint(v) for v in value) + "]"
+    if isinstance(value, dict):
+        return "{" + ",".join(f"{k!r}:{_fingerprint(v)}" for k, v in sorted(value.items())) + "}"
+    return repr(value)
+
+
+def cached(namespace: str, ttl: float | None = None):
+    """
+    Cache a function's return value in the shared backend.
+    The key covers the namespace and all bound arguments (defaults included).
+    The wrapper gains `.refresh(*args, **kwargs)` to recompute and overwrite an entry.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def make_key(args, kwargs) -> str:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            raw = ",".join(f"{k}={_fingerprint(v)}" for k, v in bound.arguments.items())
+            return f"{namespace}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
+            value = cache_get(key, _MISSING)
+            if value is not _MISSING:
+                if ttl is not None and _ttl_floor.get() is not None:
+                    cache_set(key, value, ttl)
+                return value
+            value = func(*args, **kwargs)
+            cache_set(key, value, ttl)
+            return value
+
+        def refresh(*args, **kwargs):
+            value = func(*args, **kwargs)
+            cache_set(make_key(args, kwargs), value, ttl)
+            return value
+
+        wrapper.refresh = refresh
+        return wrapper
+
+    return decorator
+
@@ -0,0 +1,51 @@
+import pandas as pd
+import statsmodels.api as sm
+from helper.cache import cached
+
+TRADING_DAYS = 252
+CAPM_TTL = 24 * 3600
+
+
+def _fit(df: pd.DataFrame):
+    X = sm.add_constant(df["Benchmark_Return"])
+    return sm.OLS(df["Stock_Return"], X).fit()
+
+
+@cached("capm", ttl=CAPM_TTL)
+def _capm_returns_and_metrics(stock: pd.Series, bench: pd.Series, rf_rate: float):
+    """Cacheable part of compute_capm: the aligned returns frame and the metrics dict."""
+    df = pd.concat([stock, bench], axis=1)
+    df.columns = ["Stock", "Benchmark"]
+    df.dropna(inplace=True)
+    df["Stock_Return"] = df["Stock"].pct_change()
+    df["Benchmark_Return"] = df["Benchmark"].pct_change()
+    df.dropna(inplace=True)
+
+    if len(df) < 3:
+        return df, {}
+
+    model = _fit(df)
+    beta = float(model.params["Benchmark_Return"])
+    metrics = {
+        "alpha": float(model.params["const"]),
+        "beta": beta,
+        "expected_return": float(rf_rate + beta * (df["Benchmark_Return"].mean() * TRADING_DAYS)),
+        "r_squared": float(model.rsquared),
+        "beta_p_value": float(model.pvalues["Benchmark_Return"]),
+        "rf_rate": float(rf_rate),
+        "observations": int(len(df)),
+    }
+    return df, metrics
+
+
+def compute_capm(stock: pd.Series, bench: pd.Series, rf_rate: float = 0.02):
+    """
+    Regress daily stock returns on benchmark returns.
+    Returns (aligned returns frame, fitted OLS model, metrics dict), or
+    (empty frame, None, {}) when there is not enough overlapping data.
+    Only the frame and metrics are cached; the OLS fit is cheap to redo.
+    """
+    df, metrics = _capm_returns_and_metrics(stock, bench, rf_rate)
+    if not metrics:
+        return df, None, {}
+    return df, _fit(df), metrics
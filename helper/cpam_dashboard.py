@@ -1,13 +1,18 @@
-import yfinance as yf
 import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
 import streamlit as st
-import ta
-from datetime import datetime
 import statsmodels.api as sm
 import plotly.express as px
-import plotly.graph_objects as go
+from helper.data_fetch import get_history
+from helper.capm import compute_capm
+
+BENCHMARKS = {
+    "S&P 500 (US)": "^GSPC",
+    "Nasdaq 100 (US)": "^NDX",
+    "Dow Jones (US)": "^DJI",
+    "Nifty 50 (India)": "^NSEI",
+    "Sensex (India)": "^BSESN",
+}
 
 
 def page_capm_dashboard():
@@ -22,13 +27,7 @@ def page_capm_dashboard():
 
     # --- Inputs ---
     ticker = st.text_input("Enter Stock Ticker", "AAPL", key="capm_dash_stock").upper().strip()
-    benchmark_map = {
-        "S&P 500 (US)": "^GSPC",
-        "Nasdaq 100 (US)": "^NDX",
-        "Dow Jones (US)": "^DJI",
-        "Nifty 50 (India)": "^NSEI",
-        "Sensex (India)": "^BSESN",
-    }
+    benchmark_map = BENCHMARKS
     benchmark_choice = st.selectbox("Select Benchmark Index", list(benchmark_map.keys()), index=0)
     benchmark_symbol = benchmark_map[benchmark_choice]
     rf_rate = st.number_input("Risk-free Rate (%)", value=2.0, step=0.1, key="capm_dash_rf") / 100
@@ -37,18 +36,15 @@ def page_capm_dashboard():
 
     if run_analysis and ticker:
         try:
-            stock_data = yf.download(ticker, period="5y", progress=False)
-            bench_data = yf.download(benchmark_symbol, period="5y", progress=False)
-        except Exception as e:
+            stock_data = get_history(ticker, period="5y")
+            bench_data = get_history(benchmark_symbol, period="5y")
+        except RuntimeError as e:
             st.error(f"⚠️ Error fetching data: {e}")
             return
 
         def get_price_column(data, name):
-            if isinstance(data, pd.DataFrame) and not data.empty:
-                if "Adj Close" in data.columns:
-                    return data["Adj Close"]
-                elif "Close" in data.columns:
-                    return data["Close"]
+            if isinstance(data, pd.DataFrame) and not data.empty and "Close" in data.columns:
+                return data["Close"]
             st.error(f"{name}: No valid price column found.")
             return pd.Series([], dtype=float)
 
@@ -59,26 +55,17 @@ def page_capm_dashboard():
             st.warning("⚠️ One of the datasets is empty. Cannot compute CAPM.")
             return
 
-        # --- Align and compute returns ---
-        df = pd.concat([stock, bench], axis=1)
-        df.columns = ["Stock", "Benchmark"]
-        df.dropna(inplace=True)
-        df["Stock_Return"] = df["Stock"].pct_change()
-        df["Benchmark_Return"] = df["Benchmark"].pct_change()
-        df.dropna(inplace=True)
+        # --- Align returns and regress ---
+        df, model, capm = compute_capm(stock, bench, rf_rate)
 
-        if df.empty:
+        if model is None:
             st.error("⚠️ Not enough data to compute CAPM.")
             return
 
-        # --- Regression ---
         X = sm.add_constant(df["Benchmark_Return"])
-        y = df["Stock_Return"]
-        model = sm.OLS(y, X).fit()
-
-        alpha = model.params["const"]
-        beta = model.params["Benchmark_Return"]
-        expected_return = rf_rate + beta * (df["Benchmark_Return"].mean() * 252)
+        alpha = capm["alpha"]
+        beta = capm["beta"]
+        expected_return = capm["expected_return"]
 
         # --- Metrics ---
         st.subheader(f"CAPM Metrics for {ticker} vs {benchmark_choice}")
@@ -1,12 +1,17 @@
 from datetime import date
 import yfinance as yf
 import pandas as pd
-import streamlit as st
+from helper.cache import cached
+
+# Daily bars only change after the close; fundamentals even less often
+HISTORY_TTL = 6 * 3600
+INFO_TTL = 24 * 3600
+HISTORY_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
 
 # -------------------------------
 # Historical Stock Data
 # -------------------------------
-@st.cache_data(show_spinner=False)
+@cached("history", ttl=HISTORY_TTL)
 def get_history(ticker: str, period: str = "5y", start: date | None = None, end: date | None = None) -> pd.DataFrame:
     """
     Fetch historical stock data (Open, High, Low, Close, Volume) using Yahoo Finance.
@@ -20,7 +25,16 @@ def get_history(ticker: str, period: str = "5y", start: date | None = None, end:
         if not isinstance(df.index, pd.DatetimeIndex):
             df.index = pd.to_datetime(df.index)
 
-        df = df[['Open', 'High', 'Low', 'Close', 'Volume']]
+        # Newer yfinance returns (field, ticker) columns even for one ticker
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = df.columns.get_level_values(0)
+
+        # Unknown tickers come back as an empty frame without the OHLCV columns
+        if df.empty:
+            return pd.DataFrame({c: pd.Series(dtype="float64") for c in HISTORY_COLUMNS},
+                                index=pd.DatetimeIndex([], name="Date"))
+
+        df = df[HISTORY_COLUMNS]
         return df.dropna()
     except Exception as e:
         raise RuntimeError(f"yfinance error for {ticker}: {e}")
@@ -29,7 +43,7 @@ def get_history(ticker: str, period: str = "5y", start: date | None = None, end:
 # -------------------------------
 # Benchmark (S&P500, Nifty, etc.)
 # -------------------------------
-@st.cache_data(show_spinner=False)
+@cached("benchmark", ttl=HISTORY_TTL)
 def get_benchmark(ticker: str = "^GSPC", start: date | None = None, end: date | None = None) -> pd.DataFrame:
     """
     Fetch benchmark index data (default: S&P 500 - ^GSPC) using Yahoo Finance.
@@ -37,9 +51,31 @@ def get_benchmark(ticker: str = "^GSPC", start: date | None = None, end: date |
     try:
         df = yf.download(ticker, start=start, end=end, auto_adjust=True, progress=False)
 
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = df.columns.get_level_values(0)
+
         if not df.empty:
             return df[["Close"]].rename(columns={"Close": "Benchmark"})
         else:
             raise ValueError(f"No data found for benchmark {ticker}")
     except Exception as e:
         raise RuntimeError(f"yfinance error fetching benchmark {ticker}: {e}")
+
+
+# -------------------------------
+# Fundamentals (yfinance info)
+# -------------------------------
+@cached("info", ttl=INFO_TTL)
+def get_info(ticker: str) -> dict:
+    """
+    Fetch the fundamentals snapshot (market cap, P/E, dividends, ...) for a ticker.
+    """
+    try:
+        stock = yf.Ticker(ticker)
+        try:
+            info = stock.get_info()  # new yfinance
+        except Exception:
+            info = stock.info       # fallback
+        return info if isinstance(info, dict) else {}
+    except Exception as e:
+        raise RuntimeError(f"yfinance error fetching info for {ticker}: {e}")
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.holtwinters import ExponentialSmoothing
+from statsmodels.tsa.arima.model import ARIMA
+from helper.arima_order import auto_arima_order, DEFAULT_ORDER
+from helper.cache import cached
+
+FORECAST_MODELS = ["Holt-Winters", "ARIMA", "Moving Average", "Prophet"]
+FORECAST_TTL = 24 * 3600
+
+
+def run_forecast(series: pd.Series, model_choice: str, horizon: int,
+                 ticker: str | None = None, auto_order: bool = False,
+                 max_workers: int | None = None):
+    """
+    Forecast a closing-price series `horizon` business days ahead.
+    Returns (forecast frame with Forecast / Lower CI / Upper CI columns, info dict).
+    Raises ValueError for unknown models or an empty forecast.
+    max_workers bounds the ARIMA order search pool (1 = search in-process).
+    """
+    order = None
+    from_cache = False
+    if model_choice == "ARIMA":
+        order = DEFAULT_ORDER
+        if auto_order and ticker:
+            order, from_cache = auto_arima_order(ticker, series, max_workers=max_workers)
+        order = list(order)
+
+    fc_df, info = _fit_forecast(series, model_choice, horizon, order)
+    if order is not None:
+        # Worked out per call: the cached payload would freeze the first run's value
+        info = {**info, "order_from_cache": from_cache}
+    return fc_df, info
+
+
+@cached("forecast", ttl=FORECAST_TTL)
+def _fit_forecast(series: pd.Series, model_choice: str, horizon: int, order: list | None = None):
+    """
+    Fit one model and forecast. Cached on the series content and ARIMA order,
+    so new bars or a newly selected order trigger a refit.
+    """
+    forecast, lower_ci, upper_ci = None, None, None
+    info = {"model": model_choice, "horizon": int(horizon)}
+
+    # Holt-Winters
+    if model_choice == "Holt-Winters":
+        model = ExponentialSmoothing(series, trend="add", seasonal=None)
+        fit = model.fit()
+        forecast = fit.forecast(horizon)
+        resid_std = np.std(fit.resid)
+        lower_ci = forecast - 1.96 * resid_std
+        upper_ci = forecast + 1.96 * resid_std
+
+    # ARIMA
+    elif model_choice == "ARIMA":
+        order = tuple(order or DEFAULT_ORDER)
+        info["order"] = list(order)
+        model = ARIMA(series, order=order)
+        fit = model.fit()
+        res = fit.get_forecast(steps=horizon)
+        forecast = res.predicted_mean
+        ci = res.conf_int(alpha=0.05)
+        lower_ci, upper_ci = ci.iloc[:, 0], ci.iloc[:, 1]
+
+    # Moving Average
+    elif model_choice == "Moving Average":
+        forecast = pd.Series([series.tail(20).mean()] * horizon)
+        lower_ci = forecast * 0.95
+        upper_ci = forecast * 1.05
+
+    # Prophet
+    elif model_choice == "Prophet":
+        from prophet import Prophet
+
+        df = pd.DataFrame({"ds": series.index, "y": series.values})
+        model = Prophet(daily_seasonality=True)
+        model.fit(df)
+
+        future = model.make_future_dataframe(periods=horizon, freq="B")
+        forecast_df = model.predict(future)
+
+        forecast = forecast_df.set_index("ds")["yhat"].iloc[-horizon:]
+        lower_ci = forecast_df.set_index("ds")["yhat_lower"].iloc[-horizon:]
+        upper_ci = forecast_df.set_index("ds")["yhat_upper"].iloc[-horizon:]
+
+    else:
+        raise ValueError(f"Unknown forecast model: {model_choice}")
+
+    # === Ensure forecast is valid floats ===
+    if forecast is None or forecast.empty:
+        raise ValueError("Forecast is empty. Try another model or ticker.")
+
+    forecast = pd.Series(forecast, dtype="float64")
+    if lower_ci is not None and upper_ci is not None:
+        lower_ci = pd.Series(lower_ci, index=forecast.index, dtype="float64")
+        upper_ci = pd.Series(upper_ci, index=forecast.index, dtype="float64")
+
+    # Assign future business-day index if missing
+    if not isinstance(forecast.index, pd.DatetimeIndex):
+        last_date = series.index[-1]
+        future_dates = pd.date_range(
+            start=last_date + pd.Timedelta(days=1),
+            periods=len(forecast),
+            freq="B"
+        )
+        forecast.index = future_dates
+        if lower_ci is not None and upper_ci is not None:
+            lower_ci.index = upper_ci.index = future_dates
+
+    # Forecast DataFrame
+    fc_df = pd.DataFrame({"Forecast": forecast})
+    if lower_ci is not None and upper_ci is not None:
+        fc_df["Lower CI"] = lower_ci
+        fc_df["Upper CI"] = upper_ci
+    return fc_df, info
@@ -0,0 +1,37 @@
+import pandas as pd
+import ta
+from helper.cache import cached
+
+# Indicator labels (as shown in the UI) and the columns each one adds
+INDICATOR_COLUMNS = {
+    "SMA (20)": ["SMA20"],
+    "SMA (50)": ["SMA50"],
+    "EMA (20)": ["EMA20"],
+    "Bollinger Bands": ["BB_MID", "BB_UPPER", "BB_LOWER"],
+    "RSI": ["RSI"],
+}
+
+INDICATOR_TTL = 24 * 3600
+
+
+@cached("indicators", ttl=INDICATOR_TTL)
+def add_indicators(data: pd.DataFrame, indicators: list[str]) -> pd.DataFrame:
+    """
+    Return a copy of an OHLCV frame with the selected technical indicators added.
+    """
+    data = data.copy()
+    if "SMA (20)" in indicators:
+        data["SMA20"] = data["Close"].rolling(20).mean()
+    if "SMA (50)" in indicators:
+        data["SMA50"] = data["Close"].rolling(50).mean()
+    if "EMA (20)" in indicators:
+        data["EMA20"] = data["Close"].ewm(span=20, adjust=False).mean()
+    if "Bollinger Bands" in indicators:
+        mid = data["Close"].rolling(20).mean()
+        std = data["Close"].rolling(20).std()
+        data["BB_MID"] = mid
+        data["BB_UPPER"] = mid + 2 * std
+        data["BB_LOWER"] = mid - 2 * std
+    if "RSI" in indicators:
+        data["RSI"] = ta.momentum.RSIIndicator(data["Close"], window=14).rsi()
+    return data
@@ -1,10 +1,10 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import streamlit as st
-import ta
 from datetime import datetime
+from helper.data_fetch import get_history, get_info
+from helper.indicators import add_indicators, INDICATOR_COLUMNS
 
 # ---------------- Utils ----------------
 def format_market_cap(value, symbol="$"):
@@ -57,7 +57,7 @@ def page_analysis():
     # Indicator selection
     indicators = st.multiselect(
         "Add Technical Indicators",
-        ["SMA (20)", "SMA (50)", "EMA (20)", "Bollinger Bands", "RSI"],
+        list(INDICATOR_COLUMNS),
         default=[]
     )
 
@@ -75,15 +75,9 @@ def page_analysis():
     # Download + info
     with st.spinner("Fetching market data..."):
         try:
-            data = yf.download(ticker, period=period, progress=False)
-            stock = yf.Ticker(ticker)
-            try:
-                info = stock.get_info()  # new yfinance
-            except Exception:
-                info = stock.info       # fallback
-                if not isinstance(info, dict):
-                    info = {}
-        except Exception as e:
+            data = get_history(ticker, period=period)
+            info = get_info(ticker)
+        except RuntimeError as e:
             st.error(f"⚠️ Error downloading data for {ticker}: {e}")
             return
 
@@ -91,13 +85,6 @@ def page_analysis():
         st.warning("⚠️ No data found for this ticker.")
         return
 
-    # Handle MultiIndex (if user accidentally passed multi-ticker)
-    if isinstance(data.columns, pd.MultiIndex):
-        try:
-            data = data.xs(ticker, axis=1, level=1)
-        except Exception:
-            data.columns = data.columns.get_level_values(0)
-
     # Ensure essential columns
     required_cols = ["Open", "High", "Low", "Close", "Volume"]
     if not all(col in data.columns for col in required_cols):
@@ -105,25 +92,13 @@ def page_analysis():
         return
 
     # Numeric coercion
+    data = data.copy()
     for col in ["Open", "High", "Low", "Close"]:
         data[col] = pd.to_numeric(data[col], errors="coerce").round(2)
     data["Volume"] = pd.to_numeric(data["Volume"], errors="coerce")
 
     # Add indicators
-    if "SMA (20)" in indicators:
-        data["SMA20"] = data["Close"].rolling(20).mean()
-    if "SMA (50)" in indicators:
-        data["SMA50"] = data["Close"].rolling(50).mean()
-    if "EMA (20)" in indicators:
-        data["EMA20"] = data["Close"].ewm(span=20, adjust=False).mean()
-    if "Bollinger Bands" in indicators:
-        mid = data["Close"].rolling(20).mean()
-        std = data["Close"].rolling(20).std()
-        data["BB_MID"] = mid
-        data["BB_UPPER"] = mid + 2 * std
-        data["BB_LOWER"] = mid - 2 * std
-    if "RSI" in indicators:
-        data["RSI"] = ta.momentum.RSIIndicator(data["Close"], window=14).rsi()
+    data = add_indicators(data, indicators)
 
     # ===== Metrics row =====
     last_close = data["Close"].iloc[-1]
@@ -0,0 +1,194 @@
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+from helper.data_fetch import get_history
+from helper.backtest import (
+    STRATEGIES, SIZING_METHODS, build_signal, size_positions, run_backtest, sweep_sma_crossover
+)
+
+
+def _load_closes(tickers: list[str], period: str) -> pd.DataFrame:
+    """
+    Close prices for several tickers side by side (tickers that fail are skipped).
+    Outer-joined on date, so shorter histories and other calendars leave NaNs;
+    sweep_sma_crossover runs each column on its own bars.
+    """
+    def one(ticker):
+        try:
+            return ticker, get_history(ticker, period=period)["Close"]
+        except Exception:
+            return ticker, None
+
+    with ThreadPoolExecutor(max_workers=min(8, len(tickers))) as pool:
+        results = list(pool.map(one, tickers))
+    closes = {t: c for t, c in results if c is not None and not c.empty}
+    return pd.DataFrame(closes).sort_index()
+
+
+def page_backtest():
+    st.markdown(
+        """
+        <h1 style='text-align: center;'>
+            🧪 Strategy Backtest
+        </h1>
+        """,
+        unsafe_allow_html=True
+    )
+
+    tab_single, tab_sweep = st.tabs(["📈 Single Backtest", "🧮 Parameter Sweep"])
+    with tab_single:
+        _single_backtest()
+    with tab_sweep:
+        _parameter_sweep()
+
+
+def _single_backtest():
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        ticker = st.text_input("Ticker", "AAPL", key="bt_ticker").upper().strip()
+    with c2:
+        period = st.selectbox("Period", ["1y", "2y", "5y", "10y", "max"], index=2, key="bt_period")
+    with c3:
+        strategy = st.selectbox("Strategy", STRATEGIES, index=0, key="bt_strategy")
+
+    # Strategy parameters
+    params = {}
+    p1, p2, p3 = st.columns(3)
+    if strategy in ("SMA Crossover", "EMA Crossover"):
+        params["fast"] = p1.number_input("Fast Window", 2, 200, 20, key="bt_fast")
+        params["slow"] = p2.number_input("Slow Window", 3, 400, 50, key="bt_slow")
+    elif strategy == "RSI Mean Reversion":
+        params["window"] = p1.number_input("RSI Window", 2, 100, 14, key="bt_rsi_window")
+        params["lower"] = p2.number_input("Buy Below", 1, 99, 30, key="bt_rsi_lower")
+        params["upper"] = p3.number_input("Exit Above", 1, 99, 70, key="bt_rsi_upper")
+    else:
+        params["window"] = p1.number_input("Band Window", 2, 200, 20, key="bt_bb_window")
+        params["n_std"] = p2.number_input("Std Devs", 0.5, 4.0, 2.0, step=0.25, key="bt_bb_std")
+
+    # Costs & sizing
+    s1, s2, s3 = st.columns(3)
+    with s1:
+        cost_bps = st.number_input("Transaction Cost (bps per trade)", 0.0, 100.0, 10.0, step=1.0, key="bt_cost")
+    with s2:
+        sizing = st.selectbox("Position Sizing", SIZING_METHODS, index=0, key="bt_sizing")
+    with s3:
+        if sizing == "Fixed Fraction":
+            fraction = st.slider("Equity Fraction", 0.1, 1.0, 1.0, step=0.05, key="bt_fraction")
+            target_vol = 0.15
+        else:
+            target_vol = st.slider("Target Volatility (%)", 5, 50, 15, key="bt_target_vol") / 100
+            fraction = 1.0
+    allow_short = False
+    if strategy in ("SMA Crossover", "EMA Crossover"):
+        allow_short = st.checkbox("Allow short positions", value=False, key="bt_short")
+
+    if st.button("🚀 Run Backtest", key="bt_run"):
+        if not ticker:
+            st.warning("⚠️ Please enter a stock ticker.")
+            return
+        if "slow" in params and params["fast"] >= params["slow"]:
+            st.warning("⚠️ Fast window must be shorter than the slow window.")
+            return
+
+        try:
+            close = get_history(ticker, period=period)["Close"].dropna()
+        except RuntimeError as e:
+            st.error(f"⚠️ Error fetching data: {e}")
+            return
+        if close.empty:
+            st.error("⚠️ No data found for this ticker.")
+            return
+
+        signal = build_signal(close, strategy, params, allow_short)
+        positions = size_positions(signal, close, sizing, fraction=fraction, target_vol=target_vol)
+        result, stats = run_backtest(close, positions, cost_bps)
+
+        # --- Metrics ---
+        m1, m2, m3, m4, m5 = st.columns(5)
+        bh_return = result["Buy & Hold"].iloc[-1] / result["Buy & Hold"].iloc[0] - 1
+        m1.metric("Total Return", f"{stats['Total Return']*100:.2f}%", f"vs B&H {bh_return*100:.2f}%")
+        m2.metric("CAGR", f"{stats['CAGR']*100:.2f}%")
+        m3.metric("Sharpe", f"{stats['Sharpe']:.2f}")
+        m4.metric("Max Drawdown", f"{stats['Max Drawdown']*100:.2f}%")
+        m5.metric("Trades", f"{int(stats['Trades'])}", f"{stats['Exposure']*100:.0f}% invested")
+
+        # --- Equity curve ---
+        st.subheader("📈 Equity Curve")
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=result.index, y=result["Equity"], mode="lines", name="Strategy"))
+        fig.add_trace(go.Scatter(x=result.index, y=result["Buy & Hold"], mode="lines",
+                                 name="Buy & Hold", line=dict(dash="dot")))
+        fig.update_layout(height=420, xaxis_title="Date", yaxis_title="Equity", template="plotly_dark")
+        st.plotly_chart(fig, use_container_width=True)
+
+        # --- Drawdown ---
+        st.subheader("📉 Drawdown")
+        fig_dd = go.Figure()
+        fig_dd.add_trace(go.Scatter(x=result.index, y=result["Drawdown"] * 100, mode="lines",
+                                    fill="tozeroy", fillcolor="rgba(239,68,68,0.2)",
+                                    line=dict(color="#ef4444"), name="Drawdown"))
+        fig_dd.update_layout(height=260, xaxis_title="Date", yaxis_title="Drawdown (%)", template="plotly_dark")
+        st.plotly_chart(fig_dd, use_container_width=True)
+
+        with st.expander("📄 Daily Positions & Returns"):
+            st.dataframe(result.tail(250).round(4))
+
+
+def _parameter_sweep():
+    st.markdown("Backtest every fast/slow **SMA crossover** pair across several tickers at once.")
+    tickers_raw = st.text_input("Tickers (comma separated)", "AAPL, MSFT, GOOGL, AMZN", key="sweep_tickers")
+    sweep_period = st.selectbox("Period", ["1y", "2y", "5y", "10y"], index=2, key="sweep_period")
+
+    g1, g2, g3 = st.columns(3)
+    with g1:
+        fast_range = st.slider("Fast Window Range", 2, 100, (5, 50), key="sweep_fast_range")
+        fast_step = st.number_input("Fast Step", 1, 50, 5, key="sweep_fast_step")
+    with g2:
+        slow_range = st.slider("Slow Window Range", 10, 300, (20, 200), key="sweep_slow_range")
+        slow_step = st.number_input("Slow Step", 1, 50, 10, key="sweep_slow_step")
+    with g3:
+        sweep_cost = st.number_input("Transaction Cost (bps)", 0.0, 100.0, 10.0, step=1.0, key="sweep_cost")
+        sweep_short = st.checkbox("Allow short positions", value=False, key="sweep_short")
+
+    if st.button("🧮 Run Sweep", key="sweep_run"):
+        tickers = list(dict.fromkeys(t.strip().upper() for t in tickers_raw.split(",") if t.strip()))
+        if not tickers:
+            st.warning("⚠️ Please enter at least one ticker.")
+            return
+
+        with st.spinner("Fetching prices..."):
+            closes = _load_closes(tickers, sweep_period)
+        if closes.empty:
+            st.error("⚠️ No data found for these tickers.")
+            return
+        missing = [t for t in tickers if t not in closes.columns]
+        if missing:
+            st.warning(f"Skipped (no data): {', '.join(missing)}")
+
+        fast_windows = range(fast_range[0], fast_range[1] + 1, int(fast_step))
+        slow_windows = range(slow_range[0], slow_range[1] + 1, int(slow_step))
+        with st.spinner("Running sweep..."):
+            sweep = sweep_sma_crossover(closes, fast_windows, slow_windows, sweep_cost, sweep_short)
+        if sweep.empty:
+            st.warning("⚠️ No valid (fast < slow) window pairs in this grid.")
+            return
+
+        st.caption(f"{len(sweep):,} backtests over {len(closes.columns)} tickers.")
+
+        # --- Heatmap of average Sharpe across tickers ---
+        st.subheader("🔥 Average Sharpe by Window Pair")
+        avg = sweep.groupby(["Fast", "Slow"])["Sharpe"].mean().unstack("Slow")
+        fig = px.imshow(avg, aspect="auto", origin="lower", color_continuous_scale="RdYlGn",
+                        labels=dict(x="Slow Window", y="Fast Window", color="Sharpe"))
+        fig.update_layout(height=460, template="plotly_dark")
+        st.plotly_chart(fig, use_container_width=True)
+
+        # --- Best pair per ticker ---
+        st.subheader("🏆 Best Pair per Ticker")
+        best = sweep.loc[sweep.groupby("Ticker")["Sharpe"].idxmax()].set_index("Ticker")
+        st.dataframe(best.round(4))
+
+        with st.expander("📄 All Results"):
+            st.dataframe(sweep.sort_values("Sharpe", ascending=False).round(4))
@@ -1,16 +1,9 @@
-import yfinance as yf
-import pandas as pd
-import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
-import ta
-from datetime import datetime
-from statsmodels.tsa.holtwinters import ExponentialSmoothing
-from statsmodels.tsa.arima.model import ARIMA
-import statsmodels.api as sm
-from prophet import Prophet
-from helper.utils import normalize_prices, daily_return, calc_beta_alpha, line_table, metric_card
+from helper.data_fetch import get_history
+from helper.forecasting import run_forecast, FORECAST_MODELS
+from helper.simulation import run_simulation, GBM_MODEL, SHOCK_METHODS
+from helper.utils import line_table
 
 def page_prediction():
 
@@ -29,18 +22,60 @@ def page_prediction():
     # Forecast horizon slider
     horizon = st.slider("Forecast Horizon (days)", 7, 60, 30, step=1, key="prediction_horizon")
 
-    # Model selector
-    model_choice = st.selectbox(
-        "Choose Forecast Model",
-        ["Holt-Winters", "ARIMA", "Moving Average", "Prophet"],
+    # Forecast mode
+    mode = st.radio(
+        "Forecast Mode",
+        ["Single Model", "Monte-Carlo Ensemble"],
         index=0,
-        key="prediction_model_choice"
+        horizontal=True,
+        key="prediction_mode"
     )
 
+    if mode == "Single Model":
+        # Model selector
+        model_choice = st.selectbox(
+            "Choose Forecast Model",
+            FORECAST_MODELS,
+            index=0,
+            key="prediction_model_choice"
+        )
+    else:
+        # Simulation settings
+        sim_models = st.multiselect(
+            "Models to Simulate",
+            FORECAST_MODELS + [GBM_MODEL],
+            default=["Holt-Winters", GBM_MODEL],
+            key="prediction_sim_models"
+        )
+        c1, c2 = st.columns(2)
+        with c1:
+            n_paths = st.slider("Simulated Paths", 1000, 10000, 5000, step=500, key="prediction_sim_paths")
+        with c2:
+            shock_method = st.radio("Shocks", SHOCK_METHODS, index=0, horizontal=True, key="prediction_sim_method")
+        sim_weights = {}
+        if len(sim_models) > 1:
+            weight_cols = st.columns(len(sim_models))
+            for col, model_name in zip(weight_cols, sim_models):
+                with col:
+                    sim_weights[model_name] = st.number_input(
+                        f"Weight: {model_name}", min_value=0.0, value=1.0, step=0.1,
+                        key=f"prediction_sim_weight_{model_name}"
+                    )
+        model_choice = None
+
+    # ARIMA order selection
+    auto_order = False
+    if model_choice == "ARIMA":
+        auto_order = st.checkbox(
+            "Auto-select ARIMA order (stepwise AIC search)",
+            value=True,
+            key="prediction_arima_auto"
+        )
+
     # Run Forecast button
-    run_forecast = st.button("🚀 Run Forecast", key="run_forecast_button")
+    forecast_clicked = st.button("🚀 Run Forecast", key="run_forecast_button")
 
-    if run_forecast:
+    if forecast_clicked:
         if not ticker:
             st.warning("⚠️ Please enter a stock ticker.")
             return
@@ -48,96 +83,40 @@ def page_prediction():
 
 
         # Download historical data
-        data = yf.download(ticker, period="2y")
+        try:
+            data = get_history(ticker, period="2y")
+        except RuntimeError as e:
+            st.error(f"⚠️ Error fetching data: {e}")
+            return
 
         if data.empty:
             st.error("⚠️ No data found for this ticker.")
             return
 
-        # Handle MultiIndex from yfinance
-        if isinstance(data.columns, pd.MultiIndex):
-            try:
-                data = data.xs(ticker, axis=1, level=1)
-            except Exception:
-                data.columns = data.columns.get_level_values(0)
-
         if "Close" not in data.columns:
             st.error("No 'Close' column found in data.")
             return
 
         series = data["Close"].dropna()
 
-        forecast, lower_ci, upper_ci = None, None, None
+        if mode == "Monte-Carlo Ensemble":
+            render_simulation(ticker, series, sim_models, horizon, n_paths, shock_method, sim_weights)
+            return
 
         try:
-            # Holt-Winters
-            if model_choice == "Holt-Winters":
-                model = ExponentialSmoothing(series, trend="add", seasonal=None)
-                fit = model.fit()
-                forecast = fit.forecast(horizon)
-                resid_std = np.std(fit.resid)
-                lower_ci = forecast - 1.96 * resid_std
-                upper_ci = forecast + 1.96 * resid_std
-
-            # ARIMA
-            elif model_choice == "ARIMA":
-                model = ARIMA(series, order=(5, 1, 0))
-                fit = model.fit()
-                res = fit.get_forecast(steps=horizon)
-                forecast = res.predicted_mean
-                ci = res.conf_int(alpha=0.05)
-                lower_ci, upper_ci = ci.iloc[:, 0], ci.iloc[:, 1]
-
-            # Moving Average
-            elif model_choice == "Moving Average":
-                forecast = pd.Series([series.tail(20).mean()] * horizon)
-                lower_ci = forecast * 0.95
-                upper_ci = forecast * 1.05
-
-            # Prophet
-            elif model_choice == "Prophet":
-                df = pd.DataFrame({"ds": series.index, "y": series.values})
-                model = Prophet(daily_seasonality=True)
-                model.fit(df)
-
-                future = model.make_future_dataframe(periods=horizon, freq="B")
-                forecast_df = model.predict(future)
-
-                forecast = forecast_df.set_index("ds")["yhat"].iloc[-horizon:]
-                lower_ci = forecast_df.set_index("ds")["yhat_lower"].iloc[-horizon:]
-                upper_ci = forecast_df.set_index("ds")["yhat_upper"].iloc[-horizon:]
-
+            with st.spinner("Fitting forecast model..."):
+                fc_df, fc_info = run_forecast(series, model_choice, horizon, ticker=ticker, auto_order=auto_order)
         except Exception as e:
             st.error(f"⚠️ Forecast model failed: {e}")
             return
 
-        # === Ensure forecast is valid floats ===
-        if forecast is None or forecast.empty:
-            st.error("⚠️ Forecast is empty. Try another model or ticker.")
-            return
+        if "order" in fc_info:
+            source = "stored" if fc_info["order_from_cache"] else "newly selected"
+            st.caption(f"Using {source} ARIMA order {tuple(fc_info['order'])}")
 
-        forecast = pd.Series(forecast, dtype="float64")
-        if lower_ci is not None and upper_ci is not None:
-            lower_ci = pd.Series(lower_ci, index=forecast.index, dtype="float64")
-            upper_ci = pd.Series(upper_ci, index=forecast.index, dtype="float64")
-
-        # Assign future business-day index if missing
-        if not isinstance(forecast.index, pd.DatetimeIndex):
-            last_date = series.index[-1]
-            future_dates = pd.date_range(
-                start=last_date + pd.Timedelta(days=1),
-                periods=len(forecast),
-                freq="B"
-            )
-            forecast.index = future_dates
-            if lower_ci is not None and upper_ci is not None:
-                lower_ci.index = upper_ci.index = future_dates
-
-        # Forecast DataFrame
-        fc_df = pd.DataFrame({"Forecast": forecast})
-        if lower_ci is not None and upper_ci is not None:
-            fc_df["Lower CI"] = lower_ci
-            fc_df["Upper CI"] = upper_ci
+        forecast = fc_df["Forecast"]
+        lower_ci = fc_df.get("Lower CI")
+        upper_ci = fc_df.get("Upper CI")
 
         # === Forecast Table ===
         st.subheader("📊 Forecast Table")
@@ -191,4 +170,73 @@ def page_prediction():
             yaxis_title="Price",
             template="plotly_dark"
         )
-        st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def render_simulation(ticker, series, models, horizon, n_paths, method, weights):
+    """Quantile table and fan chart for the Monte-Carlo ensemble."""
+    try:
+        with st.spinner(f"Simulating {n_paths:,} paths per model..."):
+            results, ensemble = run_simulation(
+                series, models, horizon, n_paths=n_paths, method=method,
+                weights=weights, ticker=ticker
+            )
+    except Exception as e:
+        st.error(f"⚠️ Simulation failed: {e}")
+        return
+
+    # === Quantile Table ===
+    st.subheader("📊 Ensemble Quantiles")
+    ensemble_q = results["Ensemble"]
+    st.plotly_chart(line_table(ensemble_q.round(3)), use_container_width=True)
+
+    # === Fan Chart ===
+    st.subheader("📉 Simulated Price Distribution")
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=series.tail(200).index,
+        y=series.tail(200).values,
+        mode="lines",
+        name="Historical"
+    ))
+
+    # A handful of raw paths for texture
+    for path in ensemble[:20]:
+        fig.add_trace(go.Scatter(
+            x=ensemble_q.index, y=path, mode="lines",
+            line=dict(width=0.5, color="rgba(148,163,184,0.35)"),
+            showlegend=False, hoverinfo="skip"
+        ))
+
+    for low, high, alpha in [("P5", "P95", 0.15), ("P25", "P75", 0.3)]:
+        fig.add_traces([
+            go.Scatter(x=ensemble_q.index, y=ensemble_q[high], mode="lines",
+                       line=dict(width=0), showlegend=False),
+            go.Scatter(x=ensemble_q.index, y=ensemble_q[low], mode="lines",
+                       line=dict(width=0), fill="tonexty",
+                       fillcolor=f"rgba(14,165,233,{alpha})", name=f"{low}–{high}")
+        ])
+
+    fig.add_trace(go.Scatter(
+        x=ensemble_q.index, y=ensemble_q["P50"],
+        mode="lines", name="Ensemble Median", line=dict(dash="dot")
+    ))
+    for model_name in models:
+        fig.add_trace(go.Scatter(
+            x=results[model_name].index, y=results[model_name]["P50"],
+            mode="lines", name=f"{model_name} Median", line=dict(width=1)
+        ))
+
+    fig.update_layout(
+        height=420,
+        xaxis_title="Date",
+        yaxis_title="Price",
+        template="plotly_dark"
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    # === Per-Model Quantiles ===
+    with st.expander("📄 Per-Model Quantiles"):
+        for model_name in models:
+            st.markdown(f"**{model_name}**")
+            st.dataframe(results[model_name].round(3))
\ No newline at end of file
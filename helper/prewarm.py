@@ -0,0 +1,217 @@
+"""
+Background pre-warming of the shared cache for a watchlist of tickers.
+
+After the market closes, prices, fundamentals, CAPM stats and default-horizon
+forecasts are recomputed for every watched ticker, so the first interactive
+request of the day is served from cache. Warmed entries are kept until the next
+scheduled run (plus WARM_MARGIN) rather than their usual ttl, so they survive
+the night and the weekend. Runs either as a daemon thread inside
+the Streamlit app (see start_scheduler) or as a separate worker:
+
+    python -m helper.prewarm            # warm once and exit
+    python -m helper.prewarm --daemon   # warm after every close
+"""
+import argparse
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from helper.cache import min_ttl, try_lock
+from helper.capm import compute_capm
+from helper.data_fetch import get_history, get_info
+from helper.forecasting import run_forecast
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Settings (environment overrides)
+# -------------------------------
+WATCHLIST = [t.strip().upper() for t in os.environ.get("STOCK_WATCHLIST", "").split(",") if t.strip()]
+BENCHMARK = os.environ.get("PREWARM_BENCHMARK", "^GSPC")
+RUN_AT = os.environ.get("PREWARM_AT", "16:30")
+TIMEZONE = os.environ.get("PREWARM_TZ", "America/New_York")
+MAX_WORKERS = int(os.environ.get("PREWARM_WORKERS", "4"))
+LOCK_TTL = 12 * 3600
+WARM_MARGIN = 2 * 3600  # warmed entries outlive the next run by this much, so it can take its time
+FORECAST_MODELS = [m.strip() for m in os.environ.get("PREWARM_MODELS", "Holt-Winters,ARIMA").split(",") if m.strip()]
+
+# Must match the defaults the pages use, otherwise the warmed keys are never read
+FORECAST_HORIZON = 30
+FORECAST_PERIOD = "2y"
+CAPM_PERIOD = "5y"
+CAPM_RF_RATE = 0.02
+
+
+# -------------------------------
+# Warming
+# -------------------------------
+def warm_ticker(ticker: str, bench_close=None) -> dict:
+    """Refresh every cached artefact for one ticker; returns the steps that failed."""
+    errors = {}
+
+    try:
+        get_info.refresh(ticker)
+    except Exception as e:
+        errors["info"] = str(e)
+
+    try:
+        history = get_history.refresh(ticker, period=CAPM_PERIOD)
+        if bench_close is not None and not history.empty:
+            compute_capm(history["Close"], bench_close, CAPM_RF_RATE)
+    except Exception as e:
+        errors["capm"] = str(e)
+
+    try:
+        series = get_history.refresh(ticker, period=FORECAST_PERIOD)["Close"].dropna()
+        for model_choice in FORECAST_MODELS:
+            try:
+                # Already on a worker thread: keep the ARIMA search in-process
+                run_forecast(series, model_choice, FORECAST_HORIZON, ticker=ticker,
+                             auto_order=model_choice == "ARIMA", max_workers=1)
+            except Exception as e:
+                errors[f"forecast:{model_choice}"] = str(e)
+    except Exception as e:
+        errors["history"] = str(e)
+
+    return errors
+
+
+def warm_ttl(now: datetime | None = None) -> float:
+    """Seconds warmed entries must live: until the next scheduled run, plus WARM_MARGIN."""
+    now = now.astimezone(ZoneInfo(TIMEZONE)) if now else datetime.now(ZoneInfo(TIMEZONE))
+    return (next_run(now) - now).total_seconds() + WARM_MARGIN
+
+
+def warm_watchlist(tickers: list[str] | None = None, max_workers: int = MAX_WORKERS,
+                   ttl: float | None = None) -> dict:
+    """
+    Warm all tickers with bounded concurrency; returns {ticker: errors} for failures.
+    Every entry written lives at least `ttl` seconds (default: warm_ttl()).
+    """
+    tickers = tickers if tickers is not None else WATCHLIST
+    if not tickers:
+        return {}
+    ttl = warm_ttl() if ttl is None else ttl
+
+    bench_close = None
+    try:
+        with min_ttl(ttl):
+            bench_close = get_history.refresh(BENCHMARK, period=CAPM_PERIOD)["Close"]
+    except Exception as e:
+        logger.warning("Pre-warm could not fetch benchmark %s: %s", BENCHMARK, e)
+
+    def warm(ticker):
+        # The ttl floor is per thread, so set it inside each worker
+        with min_ttl(ttl):
+            return warm_ticker(ticker, bench_close)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        results = dict(zip(tickers, pool.map(warm, tickers)))
+
+    failures = {t: errs for t, errs in results.items() if errs}
+    logger.info("Pre-warmed %d tickers (%d with errors)", len(tickers), len(failures))
+    return failures
+
+
+# -------------------------------
+# Scheduling
+# -------------------------------
+def next_run(now: datetime | None = None) -> datetime:
+    """Next weekday at RUN_AT in TIMEZONE, strictly after `now`."""
+    tz = ZoneInfo(TIMEZONE)
+    now = now.astimezone(tz) if now else datetime.now(tz)
+    hour, minute = (int(x) for x in RUN_AT.split(":"))
+    run = datetime.combine(now.date(), time(hour, minute), tzinfo=tz)
+    if run <= now:
+        run += timedelta(days=1)
+    while run.weekday() >= 5:
+        run += timedelta(days=1)
+    return run
+
+
+class PrewarmScheduler(threading.Thread):
+    """Daemon thread that warms the watchlist after every market close."""
+
+    def __init__(self, tickers: list[str] | None = None, run_now: bool = False,
+                 max_workers: int = MAX_WORKERS):
+        super().__init__(name="prewarm-scheduler", daemon=True)
+        self.tickers = tickers
+        self.run_now = run_now
+        self.max_workers = max_workers
+        self._stop_event = threading.Event()
+
+    def run(self):
+        if self.run_now:
+            self._warm(f"start:{datetime.now(ZoneInfo(TIMEZONE)).date().isoformat()}")
+        while not self._stop_event.is_set():
+            run_at = next_run()
+            wait = (run_at - datetime.now(ZoneInfo(TIMEZONE))).total_seconds()
+            if self._stop_event.wait(max(wait, 0)):
+                break
+            self._warm(run_at.isoformat())
+
+    def _warm(self, slot: str):
+        # Every replica runs a scheduler; only the first to claim the slot warms it
+        if not try_lock(f"prewarm:{slot}", LOCK_TTL):
+            logger.info("Pre-warm %s already claimed by another process", slot)
+            return
+        try:
+            warm_watchlist(self.tickers, max_workers=self.max_workers)
+        except Exception:
+            logger.exception("Pre-warm run failed")
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_scheduler: PrewarmScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def start_scheduler(tickers: list[str] | None = None) -> PrewarmScheduler | None:
+    """
+    Start the in-process scheduler once per process (Streamlit reruns app.py on
+    every interaction). Does nothing when no watchlist is configured.
+    """
+    global _scheduler
+    tickers = tickers if tickers is not None else WATCHLIST
+    if not tickers:
+        return None
+    with _scheduler_lock:
+        if _scheduler is None or not _scheduler.is_alive():
+            run_now = os.environ.get("PREWARM_ON_START", "0") == "1"
+            _scheduler = PrewarmScheduler(tickers, run_now=run_now)
+            _scheduler.start()
+        return _scheduler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-warm the stock cache for a watchlist")
+    parser.add_argument("tickers", nargs="*", help="Tickers to warm (default: STOCK_WATCHLIST)")
+    parser.add_argument("--daemon", action="store_true", help="Keep running and warm after every close")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    tickers = [t.upper() for t in args.tickers] or WATCHLIST
+    if not tickers:
+        parser.error("No tickers given and STOCK_WATCHLIST is empty.")
+
+    if args.daemon:
+        scheduler = PrewarmScheduler(tickers, run_now=True, max_workers=args.workers)
+        scheduler.start()
+        try:
+            scheduler.join()
+        except KeyboardInterrupt:
+            scheduler.stop()
+    else:
+        failures = warm_watchlist(tickers, max_workers=args.workers)
+        for ticker, errs in failures.items():
+            logger.warning("%s: %s", ticker, errs)
+
+
+if __name__ == "__main__":
+    main()
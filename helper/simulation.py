@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+from helper.forecasting import run_forecast
+from helper.utils import daily_return
+
+GBM_MODEL = "GBM (drift)"
+SHOCK_METHODS = ["Bootstrap", "GBM"]
+DEFAULT_QUANTILES = (0.05, 0.25, 0.50, 0.75, 0.95)
+
+
+def _log_returns(series: pd.Series) -> np.ndarray:
+    returns = np.asarray(daily_return(series.astype("float64")), dtype="float64").ravel()
+    returns = returns[np.isfinite(returns) & (returns > -1)]
+    if len(returns) < 2:
+        raise ValueError("Not enough price history to calibrate the simulation.")
+    return np.log1p(returns)
+
+
+def simulate_paths(base_paths: np.ndarray, log_returns: np.ndarray, n_paths: int,
+                   method: str = "Bootstrap", seed: int | None = None) -> np.ndarray:
+    """
+    Simulate price paths around each model's central path in one vectorised step.
+
+    base_paths is (models, horizon). Daily log shocks are either resampled from the
+    demeaned historical log returns ("Bootstrap") or drawn from a normal with the
+    same volatility ("GBM"); their cumulative sum multiplies the central path.
+    Returns an array of shape (models, n_paths, horizon).
+    """
+    base_paths = np.atleast_2d(np.asarray(base_paths, dtype="float64"))
+    n_models, horizon = base_paths.shape
+    rng = np.random.default_rng(seed)
+    size = (n_models, n_paths, horizon)
+
+    shocks_pool = log_returns - log_returns.mean()
+    if method == "Bootstrap":
+        shocks = rng.choice(shocks_pool, size=size, replace=True)
+    elif method == "GBM":
+        shocks = rng.standard_normal(size) * shocks_pool.std(ddof=1)
+    else:
+        raise ValueError(f"Unknown shock method: {method}")
+
+    np.cumsum(shocks, axis=2, out=shocks)
+    np.exp(shocks, out=shocks)
+    shocks *= base_paths[:, None, :]
+    return shocks
+
+
+def gbm_drift_path(series: pd.Series, log_returns: np.ndarray, horizon: int) -> np.ndarray:
+    """Central path of a GBM calibrated on historical log returns: S0 * exp(mu * t)."""
+    steps = np.arange(1, horizon + 1)
+    return float(series.iloc[-1]) * np.exp(log_returns.mean() * steps)
+
+
+def ensemble_paths(paths: np.ndarray, weights, seed: int | None = None) -> np.ndarray:
+    """
+    Blend per-model paths (models, n_paths, horizon) into a weighted mixture
+    of n_paths paths: each model contributes paths in proportion to its weight.
+    """
+    n_models, n_paths, _ = paths.shape
+    weights = np.clip(np.asarray(weights, dtype="float64"), 0, None)
+    if weights.sum() <= 0:
+        weights = np.ones(n_models)
+    weights = weights / weights.sum()
+
+    rng = np.random.default_rng(seed)
+    model_idx = rng.choice(n_models, size=n_paths, p=weights)
+    path_idx = rng.integers(0, n_paths, size=n_paths)
+    return paths[model_idx, path_idx]
+
+
+def quantile_labels(quantiles) -> list[str]:
+    """
+    Column labels for quantiles: 0.05 -> "P5", 0.975 -> "P97.5".
+    Raises ValueError for quantiles outside (0, 1) or ones that share a label.
+    """
+    labels = []
+    for q in quantiles:
+        if not 0 < q < 1:
+            raise ValueError(f"Quantiles must be between 0 and 1 (exclusive), got {q}.")
+        labels.append(f"P{q * 100:g}")
+    if len(set(labels)) != len(labels):
+        raise ValueError(f"Quantiles must be distinct, got {list(quantiles)}.")
+    return labels
+
+
+def path_quantiles(paths: np.ndarray, index: pd.DatetimeIndex,
+                   quantiles=DEFAULT_QUANTILES) -> pd.DataFrame:
+    """Quantiles across paths (n_paths, horizon) as columns P5, P25, ... indexed by date."""
+    columns = quantile_labels(quantiles)
+    values = np.quantile(paths, quantiles, axis=0)
+    return pd.DataFrame(values.T, index=index, columns=columns)
+
+
+def run_simulation(series: pd.Series, models: list[str], horizon: int, n_paths: int = 5000,
+                   method: str = "Bootstrap", weights: dict | None = None,
+                   quantiles=DEFAULT_QUANTILES, ticker: str | None = None,
+                   seed: int | None = None):
+    """
+    Monte-Carlo forecast for several models plus their weighted ensemble.
+    Each model's point forecast (or the GBM drift path) is the central path.
+    Returns ({model or "Ensemble": quantile frame}, ensemble paths array).
+    """
+    if not models:
+        raise ValueError("Select at least one model to simulate.")
+    quantile_labels(quantiles)
+
+    series = series.dropna()
+    log_returns = _log_returns(series)
+
+    base_paths, index = [], None
+    for model_choice in models:
+        if model_choice == GBM_MODEL:
+            base_paths.append(gbm_drift_path(series, log_returns, horizon))
+            continue
+        fc_df, _ = run_forecast(series, model_choice, horizon, ticker=ticker,
+                                auto_order=model_choice == "ARIMA")
+        base_paths.append(fc_df["Forecast"].to_numpy(dtype="float64")[:horizon])
+        index = fc_df.index[:horizon] if index is None else index
+
+    if index is None:
+        index = pd.date_range(start=series.index[-1] + pd.Timedelta(days=1), periods=horizon, freq="B")
+
+    paths = simulate_paths(np.vstack(base_paths), log_returns, n_paths, method=method, seed=seed)
+
+    results = {
+        model_choice: path_quantiles(paths[i], index, quantiles)
+        for i, model_choice in enumerate(models)
+    }
+    model_weights = [(weights or {}).get(m, 1.0) for m in models]
+    blended = ensemble_paths(paths, model_weights, seed=None if seed is None else seed + 1)
+    results["Ensemble"] = path_quantiles(blended, index, quantiles)
+    return results, blended
@@ -0,0 +1,13 @@
+import pytest
+
+from helper import cache
+
+
+@pytest.fixture
+def memory_backend():
+    """Route the shared cache to a fresh in-process backend for one test."""
+    previous = cache._backend
+    backend = cache.MemoryBackend()
+    cache.set_backend(backend)
+    yield backend
+    cache.set_backend(previous)
@@ -0,0 +1,204 @@
+import gzip
+import http.client
+import io
+import json
+import threading
+from http.server import ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("statsmodels")
+pytest.importorskip("yfinance")
+pytest.importorskip("ta")
+pa = pytest.importorskip("pyarrow")
+
+import api  # noqa: E402
+from helper import data_fetch  # noqa: E402
+
+
+def _history(n_bars=300, seed=0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.01, n_bars)))
+    index = pd.bdate_range("2023-01-02", periods=n_bars, name="Date")
+    return pd.DataFrame({"Open": close, "High": close * 1.01, "Low": close * 0.99,
+                         "Close": close, "Volume": 1_000_000.0}, index=index)
+
+
+def _fake_get_history(ticker, period="5y", start=None, end=None):
+    if ticker == "DOWN":
+        raise RuntimeError(f"yfinance error for {ticker}: timed out")
+    if ticker == "NOPE":
+        return _history().iloc[:0]
+    return _history(seed=sum(map(ord, ticker)))
+
+
+@pytest.fixture
+def server(monkeypatch, memory_backend):
+    monkeypatch.setattr(api, "get_history", _fake_get_history)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), api.ApiHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _get(address, path, headers=None):
+    conn = http.client.HTTPConnection(*address, timeout=30)
+    try:
+        conn.request("GET", path, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        conn.close()
+
+
+# -------------------------------
+# Frames & Encodings
+# -------------------------------
+def test_history_json(server):
+    status, headers, body = _get(server, "/history/aapl?period=1y")
+    assert status == 200
+    assert headers["Content-Type"] == "application/json"
+    payload = json.loads(body)
+    assert payload["ticker"] == "AAPL"
+    assert payload["columns"] == ["Date", "Open", "High", "Low", "Close", "Volume"]
+    assert len(payload["data"]) == 300
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_history_binary_formats(server, fmt):
+    status, headers, body = _get(server, f"/history/AAPL?format={fmt}")
+    assert status == 200
+    assert headers["Content-Type"] == api.CONTENT_TYPES[fmt]
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(io.BytesIO(body))
+    else:
+        table = pa.ipc.open_stream(body).read_all()
+    assert table.num_rows == 300
+    assert json.loads(table.schema.metadata[b"api"]) == {"ticker": "AAPL"}
+
+
+def test_indicators_selected_columns(server):
+    status, _, body = _get(server, "/indicators/AAPL?include=sma20,rsi")
+    assert status == 200
+    expected = ["Close", *api.INDICATOR_COLUMNS["SMA (20)"], *api.INDICATOR_COLUMNS["RSI"]]
+    assert json.loads(body)["columns"] == ["Date", *expected]
+
+
+# -------------------------------
+# Conditional Requests
+# -------------------------------
+def test_etag_round_trip_returns_304(server):
+    status, headers, _ = _get(server, "/history/AAPL")
+    assert status == 200
+    etag = headers["ETag"]
+
+    status, headers, body = _get(server, "/history/AAPL", {"If-None-Match": etag})
+    assert status == 304
+    assert headers["ETag"] == etag
+    assert body == b""
+
+    status, _, _ = _get(server, "/history/MSFT", {"If-None-Match": etag})
+    assert status == 200
+
+
+def test_gzip_and_identity_have_separate_validators(server):
+    _, plain_headers, plain_body = _get(server, "/history/AAPL")
+    status, gz_headers, gz_body = _get(server, "/history/AAPL", {"Accept-Encoding": "gzip"})
+    assert status == 200
+    assert gz_headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(gz_body) == plain_body
+    assert gz_headers["ETag"] == plain_headers["ETag"][:-1] + '-gzip"'
+
+    # A validator for one coding never revalidates the other
+    status, _, _ = _get(server, "/history/AAPL", {"Accept-Encoding": "gzip", "If-None-Match": plain_headers["ETag"]})
+    assert status == 200
+    status, _, _ = _get(server, "/history/AAPL", {"If-None-Match": gz_headers["ETag"]})
+    assert status == 200
+    status, _, _ = _get(server, "/history/AAPL", {"Accept-Encoding": "gzip", "If-None-Match": gz_headers["ETag"]})
+    assert status == 304
+
+
+# -------------------------------
+# Bulk Errors
+# -------------------------------
+def test_bulk_json_reports_errors(server):
+    status, headers, body = _get(server, "/bulk/history?tickers=AAPL,NOPE,DOWN,aapl")
+    assert status == 200
+    payload = json.loads(body)
+    assert set(payload["errors"]) == {"NOPE", "DOWN"}
+    assert json.loads(headers["X-Errors"]) == payload["errors"]
+    tickers = {row[payload["columns"].index("Ticker")] for row in payload["data"]}
+    assert tickers == {"AAPL"}
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_bulk_binary_reports_errors_in_metadata_and_header(server, fmt):
+    status, headers, body = _get(server, f"/bulk/history?tickers=AAPL,NOPE&format={fmt}")
+    assert status == 200
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(io.BytesIO(body))
+    else:
+        table = pa.ipc.open_stream(body).read_all()
+    errors = json.loads(table.schema.metadata[b"api"])["errors"]
+    assert list(errors) == ["NOPE"]
+    assert json.loads(headers["X-Errors"]) == errors
+
+
+def test_bulk_all_failed_is_404(server):
+    status, _, body = _get(server, "/bulk/history?tickers=NOPE")
+    assert status == 404
+    assert "NOPE" in json.loads(body)["error"]
+
+
+# -------------------------------
+# Errors & Validation
+# -------------------------------
+def test_unknown_ticker_is_404_and_upstream_failure_502(server):
+    status, _, body = _get(server, "/history/NOPE")
+    assert status == 404
+    assert json.loads(body) == {"error": "No data found for NOPE."}
+    status, _, _ = _get(server, "/history/DOWN")
+    assert status == 502
+
+
+@pytest.mark.parametrize("path", [
+    "/history/AAPL?format=xml",
+    "/indicators/AAPL?include=macd",
+    "/forecast/AAPL?model=LSTM",
+    "/forecast/AAPL?horizon=abc",
+    "/forecast/AAPL?horizon=0",
+    "/forecast/AAPL?horizon=366",
+    "/capm/AAPL?rf=high",
+    "/bulk/history",
+    "/bulk/history?tickers=" + ",".join(f"T{i}" for i in range(api.MAX_BULK_TICKERS + 1)),
+])
+def test_invalid_parameters_are_400(server, path):
+    status, headers, body = _get(server, path)
+    assert status == 400
+    assert headers["Content-Type"] == "application/json"
+    assert "error" in json.loads(body)
+
+
+def test_unknown_endpoint_is_404(server):
+    status, _, _ = _get(server, "/prices/AAPL")
+    assert status == 404
+
+
+def test_get_history_unknown_ticker_returns_empty_frame(memory_backend, monkeypatch):
+    # yfinance answers an unknown symbol with an empty, column-less frame
+    monkeypatch.setattr(data_fetch.yf, "download", lambda *args, **kwargs: pd.DataFrame())
+    data = data_fetch.get_history("NOPE", period="1y")
+    assert data.empty
+    assert list(data.columns) == data_fetch.HISTORY_COLUMNS
+    # The empty result survives the cache round trip
+    assert data_fetch.get_history("NOPE", period="1y").empty
+
+    with pytest.raises(api.ApiError) as excinfo:
+        api.history_frame("NOPE", {})
+    assert excinfo.value.status == 404
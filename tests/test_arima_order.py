@@ -0,0 +1,165 @@
+import warnings
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("statsmodels")
+
+from helper import arima_order  # noqa: E402
+from helper.arima_order import (  # noqa: E402
+    DEFAULT_ORDER, REFIT_AFTER_BARS, _is_stale, auto_arima_order, choose_d, select_arima_order
+)
+
+
+def _series(values) -> pd.Series:
+    return pd.Series(values, index=pd.bdate_range("2022-01-03", periods=len(values)), name="Close")
+
+
+def _ar1(n=300, phi=0.7, seed=0) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    x = np.zeros(n)
+    for t in range(1, n):
+        x[t] = phi * x[t - 1] + rng.normal()
+    return _series(100 + x)
+
+
+def _random_walk(n=300, seed=0) -> pd.Series:
+    return _series(100 + np.cumsum(np.random.default_rng(seed).normal(size=n)))
+
+
+# -------------------------------
+# Differencing
+# -------------------------------
+def test_choose_d_stationary_and_random_walk():
+    assert choose_d(np.random.default_rng(0).normal(size=300)) == 0
+    assert choose_d(_random_walk().to_numpy()) == 1
+
+
+def test_choose_d_short_series_stops_early():
+    assert choose_d(np.arange(5.0)) == 0
+
+
+# -------------------------------
+# Stepwise Search
+# -------------------------------
+def test_short_series_uses_default_order():
+    assert select_arima_order(_ar1(n=20), max_workers=1) == DEFAULT_ORDER
+
+
+def test_stepwise_search_finds_stationary_order():
+    p, d, q = select_arima_order(_ar1(), max_p=3, max_q=3, max_workers=1)
+    assert d == 0
+    assert 0 <= p <= 3 and 0 <= q <= 3
+    assert p + q >= 1
+
+
+def test_stepwise_search_respects_bounds():
+    p, d, q = select_arima_order(_random_walk(), max_p=1, max_q=0, max_workers=1)
+    assert d == 1
+    assert p <= 1 and q == 0
+
+
+def test_pooled_search_matches_in_process_without_fork_warnings():
+    series = _ar1(n=200)
+    expected = select_arima_order(series, max_p=2, max_q=2, max_workers=1)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        assert select_arima_order(series, max_p=2, max_q=2, max_workers=2) == expected
+        # The pool is created once and re-used by later searches
+        pool = arima_order._pools[2]
+        assert select_arima_order(series, max_p=2, max_q=2, max_workers=2) == expected
+        assert arima_order._pools[2] is pool
+
+
+class _BreaksAfterFirstBatch:
+    """Pool stand-in that runs the starting candidates, then dies like a killed worker pool."""
+
+    def __init__(self, first_batch: int):
+        self.remaining = first_batch
+        self.shut_down = False
+
+    def submit(self, fn, *args):
+        if self.remaining <= 0:
+            raise BrokenProcessPool("worker died")
+        self.remaining -= 1
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+def test_broken_pool_during_neighbour_search_falls_back(monkeypatch):
+    series = _ar1(n=200)
+    expected = select_arima_order(series, max_p=2, max_q=2, max_workers=1)
+    pool = _BreaksAfterFirstBatch(first_batch=4)
+    monkeypatch.setattr(arima_order, "_get_pool", lambda max_workers: pool)
+
+    assert select_arima_order(series, max_p=2, max_q=2, max_workers=4) == expected
+    assert pool.shut_down
+
+
+# -------------------------------
+# Refit Rules
+# -------------------------------
+def _entry(series: pd.Series, **overrides) -> dict:
+    entry = {
+        "order": [1, 0, 0],
+        "criterion": "aic",
+        "n_obs": len(series),
+        "last_date": series.index[-1].isoformat(),
+        "last_close": float(series.iloc[-1]),
+    }
+    entry.update(overrides)
+    return entry
+
+
+def test_is_stale_unchanged_data_is_fresh():
+    series = _random_walk()
+    assert not _is_stale(_entry(series), series, "aic")
+
+
+def test_is_stale_after_enough_new_bars():
+    series = _random_walk(n=300 + REFIT_AFTER_BARS)
+    fitted = series.iloc[:300]
+    # Keep the close unchanged so only the bar count can trigger a refit
+    series.iloc[-1] = fitted.iloc[-1]
+    assert not _is_stale(_entry(fitted), series.iloc[:300 + REFIT_AFTER_BARS - 1], "aic")
+    assert _is_stale(_entry(fitted), series, "aic")
+
+
+def test_is_stale_when_history_shrinks():
+    series = _random_walk()
+    assert _is_stale(_entry(series, n_obs=len(series) + REFIT_AFTER_BARS + 1), series, "aic")
+
+
+def test_is_stale_on_price_drift():
+    series = _random_walk()
+    assert not _is_stale(_entry(series, last_close=float(series.iloc[-1]) * 1.05), series, "aic")
+    assert _is_stale(_entry(series, last_close=float(series.iloc[-1]) * 1.2), series, "aic")
+
+
+def test_is_stale_on_criterion_change():
+    series = _random_walk()
+    assert _is_stale(_entry(series), series, "bic")
+
+
+def test_auto_arima_order_reuses_stored_order(memory_backend, monkeypatch):
+    calls = []
+
+    def fake_search(series, **kwargs):
+        calls.append(len(series))
+        return (1, 1, 1)
+
+    monkeypatch.setattr(arima_order, "select_arima_order", fake_search)
+    series = _random_walk()
+
+    assert auto_arima_order("aapl", series, max_workers=1) == ((1, 1, 1), False)
+    assert auto_arima_order("AAPL", series, max_workers=1) == ((1, 1, 1), True)
+    assert auto_arima_order("AAPL", series, criterion="bic") == ((1, 1, 1), False)
+    assert auto_arima_order("AAPL", series, criterion="bic", force=True) == ((1, 1, 1), False)
+    assert len(calls) == 3
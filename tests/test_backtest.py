@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from helper.backtest import (
+    PERFORMANCE_COLUMNS, crossover_signal, performance_stats, run_backtest, sma_stack, sweep_sma_crossover
+)
+
+
+def _prices(n_bars=400, tickers=("AAA", "BBB", "CCC"), seed=0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2020-01-01", periods=n_bars)
+    return pd.DataFrame(
+        {t: 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.012, n_bars))) for t in tickers},
+        index=index,
+    )
+
+
+def _assert_matches_run_backtest(sweep: pd.DataFrame, prices: pd.DataFrame, cost_bps, allow_short):
+    for _, row in sweep.iterrows():
+        close = prices[row["Ticker"]].dropna()
+        signal = crossover_signal(close, int(row["Fast"]), int(row["Slow"]), allow_short=allow_short)
+        _, stats = run_backtest(close, signal, cost_bps)
+        for name in PERFORMANCE_COLUMNS:
+            assert row[name] == pytest.approx(stats[name], rel=1e-9, abs=1e-12), (row["Ticker"], name)
+
+
+def test_sma_stack_matches_rolling_mean():
+    prices = _prices()
+    stack = sma_stack(prices.to_numpy(), [5, 20])
+    expected = prices.rolling(20).mean().to_numpy()
+    np.testing.assert_allclose(stack[1], expected, equal_nan=True)
+
+
+def test_performance_stats_flat_position():
+    stats = performance_stats(np.zeros(10), np.zeros(10))
+    assert stats["Total Return"] == 0
+    assert stats["Sharpe"] == 0
+    assert stats["Trades"] == 0
+    assert stats["Exposure"] == 0
+
+
+def test_run_backtest_charges_costs_on_position_changes():
+    close = pd.Series([100.0, 101.0, 102.0, 101.0], index=pd.bdate_range("2024-01-01", periods=4))
+    positions = pd.Series([1.0, 1.0, 0.0, 0.0], index=close.index)
+    result, stats = run_backtest(close, positions, cost_bps=10)
+    # Entered on bar 1 (pays 10 bps), exited on bar 3 (pays 10 bps)
+    expected = [0.0, 0.01 - 0.001, 102 / 101 - 1, -0.001]
+    np.testing.assert_allclose(result["Strategy Return"], expected)
+    assert stats["Trades"] == 2
+
+
+@pytest.mark.parametrize("allow_short", [False, True])
+def test_sweep_matches_run_backtest(allow_short):
+    prices = _prices()
+    sweep = sweep_sma_crossover(prices, [5, 10, 30], [10, 20, 60], cost_bps=7, allow_short=allow_short)
+    # 3 + 2 + 1 valid (fast < slow) pairs per ticker
+    assert len(sweep) == 3 * 6
+    assert (sweep["Fast"] < sweep["Slow"]).all()
+    _assert_matches_run_backtest(sweep, prices, 7, allow_short)
+
+
+def test_sweep_shorter_history_and_gaps_match_run_backtest():
+    prices = _prices()
+    prices.iloc[:150, 1] = np.nan      # BBB listed later
+    prices.iloc[::13, 2] = np.nan      # CCC trades on a different calendar
+    sweep = sweep_sma_crossover(prices, [5, 10], [20, 50], cost_bps=10)
+    _assert_matches_run_backtest(sweep, prices, 10, False)
+
+
+def test_sweep_without_valid_pairs_is_empty():
+    sweep = sweep_sma_crossover(_prices(), [50], [10, 20])
+    assert sweep.empty
+    assert list(sweep.columns) == ["Ticker", "Fast", "Slow"] + PERFORMANCE_COLUMNS
@@ -0,0 +1,212 @@
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from helper import cache
+from helper.cache import (
+    MemoryBackend, RedisBackend, SQLiteBackend, backend_from_url, cache_get, cache_set, cached, deserialize,
+    min_ttl, serialize, try_lock
+)
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend()
+    if request.param == "redis":
+        fakeredis = pytest.importorskip("fakeredis")
+        return RedisBackend(client=fakeredis.FakeRedis())
+    return SQLiteBackend(str(tmp_path / "cache.sqlite"))
+
+
+def _frame() -> pd.DataFrame:
+    index = pd.bdate_range("2024-01-01", periods=5, name="Date")
+    return pd.DataFrame({"Close": np.arange(5.0), "Volume": np.arange(5)}, index=index)
+
+
+# -------------------------------
+# Serialisation
+# -------------------------------
+def test_round_trip_frame_series_and_tuple():
+    frame = _frame()
+    series = frame["Close"].rename("AAPL")
+    value = (frame, series, {"beta": 1.2, "observations": 5})
+
+    restored = deserialize(serialize(value))
+    pd.testing.assert_frame_equal(restored[0], frame, check_freq=False)
+    pd.testing.assert_series_equal(restored[1], series, check_freq=False)
+    assert restored[2] == {"beta": 1.2, "observations": 5}
+
+
+def test_payloads_are_never_pickled():
+    assert serialize({"a": 1})[:1] == b"J"
+    assert serialize(_frame())[:1] == b"F"
+    with pytest.raises(TypeError):
+        serialize(object())
+    with pytest.raises(ValueError):
+        deserialize(b"\x80\x04pickle")
+
+
+# -------------------------------
+# Backends
+# -------------------------------
+def test_backend_get_set_delete_and_stats(backend):
+    assert backend.get("k") is None
+    backend.set("k", b"value")
+    assert backend.get("k") == b"value"
+    backend.delete("k")
+    assert backend.get("k") is None
+
+    stats = backend.stats()
+    assert (stats["hits"], stats["misses"], stats["sets"]) == (1, 2, 1)
+    assert stats["hit_rate"] == pytest.approx(1 / 3)
+
+
+def test_backend_expires_entries(backend, monkeypatch):
+    backend.set("k", b"value", ttl=10)
+    if isinstance(backend, RedisBackend):
+        # Expiry is the server's job; check it was asked to expire the key
+        assert 0 < backend.client.ttl(backend.prefix + "k") <= 10
+        return
+    now = cache.time.time()
+    monkeypatch.setattr(cache.time, "time", lambda: now + 11)
+    assert backend.get("k") is None
+    assert backend.add("k", b"again", ttl=10)
+
+
+def test_backend_clear(backend):
+    backend.set("a", b"1")
+    backend.set("b", b"2")
+    backend.clear()
+    assert backend.get("a") is None and backend.get("b") is None
+
+
+def test_backend_add_only_claims_once(backend):
+    assert backend.add("lock", b"1", ttl=60)
+    assert not backend.add("lock", b"2", ttl=60)
+    assert backend.get("lock") == b"1"
+
+
+def test_backend_add_is_atomic_across_threads(backend):
+    n_threads = 16
+    barrier = threading.Barrier(n_threads)
+    claimed = []
+
+    def claim():
+        barrier.wait()
+        if backend.add("lock", b"1", ttl=60):
+            claimed.append(threading.get_ident())
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for _ in range(20):
+            backend.delete("lock")
+            claimed.clear()
+            threads = [threading.Thread(target=claim) for _ in range(n_threads)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert len(claimed) == 1
+    finally:
+        sys.setswitchinterval(interval)
+
+
+def test_redis_backend_keeps_keys_under_prefix():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    client.set("other", b"x")
+    backend = RedisBackend(client=client, prefix="test:")
+    backend.set("k", b"value")
+    assert client.get("test:k") == b"value"
+    backend.clear()
+    assert client.get("other") == b"x"
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(max_bytes=10)
+    backend.set("a", b"12345")
+    backend.set("b", b"12345")
+    backend.get("a")
+    backend.set("c", b"12345")
+    assert backend.get("a") == b"12345"
+    assert backend.get("b") is None
+    assert backend.stats()["evictions"] == 1
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    SQLiteBackend(path).set("k", b"value")
+    assert SQLiteBackend(path).get("k") == b"value"
+
+
+def test_backend_from_url(tmp_path):
+    assert isinstance(backend_from_url("memory://"), MemoryBackend)
+    assert isinstance(backend_from_url(f"sqlite:///{tmp_path / 'c.sqlite'}"), SQLiteBackend)
+
+
+# -------------------------------
+# Helpers & Decorator
+# -------------------------------
+def test_cache_get_set_and_try_lock(memory_backend):
+    assert cache_get("missing", "default") == "default"
+    cache_set("key", [1, 2, 3])
+    assert cache_get("key") == [1, 2, 3]
+
+    assert try_lock("prewarm:slot", 60)
+    assert not try_lock("prewarm:slot", 60)
+
+
+def test_cached_decorator_keys_on_arguments_and_refreshes(memory_backend):
+    calls = []
+
+    @cached("test", ttl=60)
+    def compute(frame: pd.DataFrame, scale: float = 1.0):
+        calls.append(scale)
+        return {"total": float(frame["Close"].sum() * scale)}
+
+    frame = _frame()
+    assert compute(frame) == {"total": 10.0}
+    assert compute(frame, scale=1.0) == {"total": 10.0}
+    assert compute(frame, 2.0) == {"total": 20.0}
+    assert calls == [1.0, 2.0]
+
+    changed = frame.assign(Close=frame["Close"] + 1)
+    assert compute(changed) == {"total": 15.0}
+    compute.refresh(frame)
+    assert calls == [1.0, 2.0, 1.0, 1.0]
+
+
+def test_min_ttl_extends_writes_and_restamps_hits(memory_backend, monkeypatch):
+    calls = []
+
+    @cached("test", ttl=10)
+    def compute(x):
+        calls.append(x)
+        return x * 2
+
+    compute(1)
+    with min_ttl(100):
+        cache_set("plain", "value", ttl=10)
+        compute(1)      # hit, re-stamped with the floor
+        compute(2)      # miss, written with the floor
+
+    now = cache.time.time()
+    monkeypatch.setattr(cache.time, "time", lambda: now + 50)
+    assert cache_get("plain") == "value"
+    assert (compute(1), compute(2)) == (2, 4)
+    assert calls == [1, 2]
+
+
+def test_cached_skips_values_it_cannot_encode(memory_backend):
+    @cached("test")
+    def make():
+        return object()
+
+    make()
+    assert memory_backend.stats()["sets"] == 0
+    assert memory_backend.stats()["errors"] == 1
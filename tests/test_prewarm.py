@@ -0,0 +1,143 @@
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("statsmodels")
+pytest.importorskip("yfinance")
+
+from helper import cache, data_fetch, prewarm  # noqa: E402
+from helper.capm import compute_capm  # noqa: E402
+from helper.data_fetch import get_history, get_info  # noqa: E402
+from helper.forecasting import run_forecast  # noqa: E402
+
+NY = ZoneInfo("America/New_York")
+
+
+@pytest.fixture(autouse=True)
+def schedule(monkeypatch):
+    monkeypatch.setattr(prewarm, "RUN_AT", "16:30")
+    monkeypatch.setattr(prewarm, "TIMEZONE", "America/New_York")
+
+
+# -------------------------------
+# Scheduling
+# -------------------------------
+@pytest.mark.parametrize("now, expected", [
+    (datetime(2026, 10, 14, 16, 0), datetime(2026, 10, 14, 16, 30)),   # Wed before the cutoff
+    (datetime(2026, 10, 14, 16, 30), datetime(2026, 10, 15, 16, 30)),  # exactly at the cutoff
+    (datetime(2026, 10, 14, 17, 0), datetime(2026, 10, 15, 16, 30)),   # Wed after the close
+    (datetime(2026, 10, 16, 17, 0), datetime(2026, 10, 19, 16, 30)),   # Fri evening -> Monday
+    (datetime(2026, 10, 17, 10, 0), datetime(2026, 10, 19, 16, 30)),   # Saturday -> Monday
+])
+def test_next_run(now, expected):
+    assert prewarm.next_run(now.replace(tzinfo=NY)) == expected.replace(tzinfo=NY)
+
+
+def test_next_run_converts_other_timezones():
+    now = datetime(2026, 10, 14, 20, 0, tzinfo=ZoneInfo("UTC"))  # 16:00 in New York
+    assert prewarm.next_run(now) == datetime(2026, 10, 14, 16, 30, tzinfo=NY)
+
+
+def test_warm_ttl_covers_the_weekend():
+    friday = datetime(2026, 10, 16, 16, 31, tzinfo=NY)
+    monday_run = datetime(2026, 10, 19, 16, 30, tzinfo=NY)
+    assert prewarm.warm_ttl(friday) == (monday_run - friday).total_seconds() + prewarm.WARM_MARGIN
+
+
+def test_warm_is_claimed_once_per_slot(memory_backend, monkeypatch):
+    runs = []
+    monkeypatch.setattr(prewarm, "warm_watchlist", lambda tickers, max_workers: runs.append(tickers))
+
+    replica_a = prewarm.PrewarmScheduler(["AAPL"])
+    replica_b = prewarm.PrewarmScheduler(["AAPL"])
+    replica_a._warm("2026-10-14T16:30:00-04:00")
+    replica_b._warm("2026-10-14T16:30:00-04:00")
+    assert runs == [["AAPL"]]
+
+    replica_b._warm("2026-10-15T16:30:00-04:00")
+    assert len(runs) == 2
+
+
+def test_warm_logs_failures_instead_of_raising(memory_backend, monkeypatch):
+    def boom(tickers, max_workers):
+        raise RuntimeError("network down")
+
+    monkeypatch.setattr(prewarm, "warm_watchlist", boom)
+    prewarm.PrewarmScheduler(["AAPL"])._warm("slot")
+
+
+# -------------------------------
+# Warmed Entries
+# -------------------------------
+class _FakeYahoo:
+    """yfinance stand-in: daily bars ending on the last close, counting downloads."""
+
+    def __init__(self, last_close: str):
+        self.last_close = pd.Timestamp(last_close)
+        self.downloads = 0
+
+    def download(self, ticker, period="5y", start=None, end=None, **kwargs):
+        self.downloads += 1
+        years = int(period.rstrip("y"))
+        index = pd.bdate_range(end=self.last_close, periods=252 * years, name="Date")
+        rng = np.random.default_rng(sum(map(ord, ticker)))
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, len(index))))
+        return pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close,
+                             "Volume": 1e6}, index=index)
+
+    def Ticker(self, ticker):
+        return SimpleNamespace(get_info=lambda: {"symbol": ticker, "marketCap": 1e12})
+
+
+def _advance_cache_clock(monkeypatch, seconds: float):
+    monkeypatch.setattr(cache, "time", SimpleNamespace(time=lambda: time.time() + seconds))
+
+
+def _page_lookups(ticker: str):
+    """What the prediction and CAPM pages fetch for a ticker with their default settings."""
+    series = get_history(ticker, period=prewarm.FORECAST_PERIOD)["Close"].dropna()
+    run_forecast(series, "Holt-Winters", prewarm.FORECAST_HORIZON, ticker=ticker)
+    stock = get_history(ticker, period=prewarm.CAPM_PERIOD)["Close"]
+    bench = get_history(prewarm.BENCHMARK, period=prewarm.CAPM_PERIOD)["Close"]
+    compute_capm(stock, bench, prewarm.CAPM_RF_RATE)
+    get_info(ticker)
+
+
+def test_warmed_entries_last_until_next_run(memory_backend, monkeypatch):
+    yahoo = _FakeYahoo("2026-10-16")
+    monkeypatch.setattr(data_fetch, "yf", yahoo)
+    monkeypatch.setattr(prewarm, "FORECAST_MODELS", ["Holt-Winters"])
+
+    friday_close = datetime(2026, 10, 16, 16, 30, tzinfo=NY)
+    failures = prewarm.warm_watchlist(["AAPL"], max_workers=1, ttl=prewarm.warm_ttl(friday_close))
+    assert failures == {}
+    downloads = yahoo.downloads
+    misses = memory_backend.stats()["misses"]
+
+    # Monday morning, 65 hours later: everything the pages need is still warm
+    monday_morning = datetime(2026, 10, 19, 9, 30, tzinfo=NY)
+    _advance_cache_clock(monkeypatch, (monday_morning - friday_close).total_seconds())
+    _page_lookups("AAPL")
+    assert yahoo.downloads == downloads
+    assert memory_backend.stats()["misses"] == misses
+
+    # After the next scheduled run (plus margin) the entries finally expire
+    monday_run = datetime(2026, 10, 19, 16, 30, tzinfo=NY)
+    _advance_cache_clock(monkeypatch, (monday_run - friday_close).total_seconds() + prewarm.WARM_MARGIN + 60)
+    get_history("AAPL", period=prewarm.FORECAST_PERIOD)
+    assert yahoo.downloads == downloads + 1
+
+
+def test_interactive_entries_keep_their_own_ttl(memory_backend, monkeypatch):
+    yahoo = _FakeYahoo("2026-10-16")
+    monkeypatch.setattr(data_fetch, "yf", yahoo)
+    get_history("MSFT", period="2y")
+
+    _advance_cache_clock(monkeypatch, data_fetch.HISTORY_TTL + 60)
+    get_history("MSFT", period="2y")
+    assert yahoo.downloads == 2
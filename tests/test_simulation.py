@@ -0,0 +1,91 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# helper.simulation pulls in the forecasting models and the Streamlit helpers
+pytest.importorskip("statsmodels")
+pytest.importorskip("streamlit")
+if sys.version_info < (3, 12):
+    pytest.skip("helper.utils requires Python 3.12+", allow_module_level=True)
+
+from helper.simulation import (  # noqa: E402
+    GBM_MODEL, ensemble_paths, gbm_drift_path, path_quantiles, quantile_labels, run_simulation, simulate_paths
+)
+
+
+def _close(n_bars=300, seed=0) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2023-01-02", periods=n_bars)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0.0005, 0.01, n_bars))), index=index, name="Close")
+
+
+@pytest.mark.parametrize("method", ["Bootstrap", "GBM"])
+def test_simulate_paths_shape_and_seed(method):
+    base = np.vstack([np.full(10, 100.0), np.full(10, 50.0)])
+    log_returns = np.log1p(_close().pct_change().dropna().to_numpy())
+
+    paths = simulate_paths(base, log_returns, n_paths=2000, method=method, seed=1)
+    assert paths.shape == (2, 2000, 10)
+    assert (paths > 0).all()
+    np.testing.assert_array_equal(paths, simulate_paths(base, log_returns, 2000, method=method, seed=1))
+    # Shocks are demeaned, so the median path stays near each central path
+    np.testing.assert_allclose(np.median(paths[:, :, -1], axis=1), [100.0, 50.0], rtol=0.03)
+
+
+def test_simulate_paths_rejects_unknown_method():
+    with pytest.raises(ValueError):
+        simulate_paths(np.ones((1, 5)), np.array([0.01, -0.01]), 10, method="Sobol")
+
+
+def test_gbm_drift_path_starts_from_last_close():
+    close = _close()
+    log_returns = np.log1p(close.pct_change().dropna().to_numpy())
+    path = gbm_drift_path(close, log_returns, 5)
+    expected = close.iloc[-1] * np.exp(log_returns.mean() * np.arange(1, 6))
+    np.testing.assert_allclose(path, expected)
+
+
+def test_ensemble_paths_follow_weights():
+    paths = np.stack([np.zeros((1000, 3)), np.ones((1000, 3))])
+    blended = ensemble_paths(paths, [0.0, 1.0], seed=0)
+    assert blended.shape == (1000, 3)
+    assert (blended == 1).all()
+
+    mixed = ensemble_paths(paths, [1.0, 3.0], seed=0)
+    assert mixed[:, 0].mean() == pytest.approx(0.75, abs=0.05)
+
+
+def test_path_quantiles_columns_and_order():
+    paths = np.random.default_rng(0).normal(size=(5000, 4))
+    index = pd.bdate_range("2024-01-01", periods=4)
+    quantiles = path_quantiles(paths, index)
+    assert list(quantiles.columns) == ["P5", "P25", "P50", "P75", "P95"]
+    assert (quantiles.diff(axis=1).iloc[:, 1:] > 0).all().all()
+
+
+def test_path_quantiles_fractional_percentiles():
+    paths = np.random.default_rng(0).normal(size=(5000, 4))
+    index = pd.bdate_range("2024-01-01", periods=4)
+    quantiles = path_quantiles(paths, index, (0.025, 0.5, 0.975))
+    assert list(quantiles.columns) == ["P2.5", "P50", "P97.5"]
+    np.testing.assert_allclose(quantiles["P97.5"], np.quantile(paths, 0.975, axis=0))
+    assert quantile_labels((0.001, 0.004, 0.999)) == ["P0.1", "P0.4", "P99.9"]
+
+
+@pytest.mark.parametrize("quantiles", [(0.0, 0.5), (0.5, 1.0), (-0.1, 0.5), (0.5, 0.5)])
+def test_path_quantiles_rejects_invalid_quantiles(quantiles):
+    with pytest.raises(ValueError):
+        path_quantiles(np.zeros((10, 2)), pd.bdate_range("2024-01-01", periods=2), quantiles)
+
+
+def test_run_simulation_gbm_only():
+    close = _close()
+    results, blended = run_simulation(close, [GBM_MODEL], horizon=20, n_paths=500, seed=3)
+    assert set(results) == {GBM_MODEL, "Ensemble"}
+    assert blended.shape == (500, 20)
+    assert results["Ensemble"].index[0] > close.index[-1]
+
+    with pytest.raises(ValueError):
+        run_simulation(close, [], horizon=20)